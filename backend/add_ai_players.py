@@ -8,23 +8,20 @@ import uuid
 from ai.cfr_engine import PokerAI
 
 
-async def add_ai_player(table_id: str, player_name: str):
-    """Add an AI player to the table."""
-    import aiohttp
-    
-    async with aiohttp.ClientSession() as session:
-        # Join table
-        async with session.post(
-            f"http://localhost:8000/api/tables/{table_id}/join?player_name={player_name}"
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                player_id = data["player_id"]
-                print(f"✅ AI player '{player_name}' joined with ID: {player_id}")
-                return player_id
-            else:
-                print(f"❌ Failed to add AI player '{player_name}'")
-                return None
+async def add_ai_player(session, table_id: str, player_name: str):
+    """Add an AI player to the table using a shared client session."""
+    # Join table
+    async with session.post(
+        f"http://localhost:8000/api/tables/{table_id}/join?player_name={player_name}"
+    ) as response:
+        if response.status == 200:
+            data = await response.json()
+            player_id = data["player_id"]
+            print(f"✅ AI player '{player_name}' joined with ID: {player_id}")
+            return player_id
+        else:
+            print(f"❌ Failed to add AI player '{player_name}'")
+            return None
 
 
 async def main():
@@ -47,12 +44,21 @@ async def main():
         "AI-Epsilon", "AI-Zeta", "AI-Eta", "AI-Theta"
     ]
     
-    player_ids = []
-    for i in range(num_players):
-        player_name = ai_names[i]
-        player_id = await add_ai_player(table_id, player_name)
-        if player_id:
-            player_ids.append((player_id, player_name))
+    import aiohttp
+
+    # One pooled session for all joins, sent concurrently
+    connector = aiohttp.TCPConnector(limit=num_players, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(*[
+            add_ai_player(session, table_id, player_name)
+            for player_name in ai_names[:num_players]
+        ])
+
+    player_ids = [
+        (player_id, player_name)
+        for player_id, player_name in zip(results, ai_names)
+        if player_id
+    ]
     
     print(f"\n✅ Successfully added {len(player_ids)} AI players")
     print("\nAI Players:")
@@ -2,90 +2,332 @@
 AI Engine using CFR (Counterfactual Regret Minimization) algorithm.
 This is a simplified implementation for 9-max NLHE.
 """
+import multiprocessing
+import os
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Tuple, Optional, Sequence
+
+try:
+    import cupy  # Optional GPU backend for batched regret matching
+except ImportError:
+    cupy = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Fall back to plain Python when numba is unavailable
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+from game.poker_game import CARD_INDEX, PHASE_CODES, PokerGame, seed_rng
+from models.game_state import GamePhase
+
+# Shared PCG64 generator used for action sampling
+_RNG = np.random.default_rng()
+
+# Shared read-only strategy returned for information sets without data
+_UNIFORM = np.full(3, 1.0 / 3)
+_UNIFORM.setflags(write=False)
+
+
+# Information sets are packed into a single integer key:
+#   phase:3 | pot:10 | current_bet:10 | player_stack:10 | player_bet:10 | num_players:4
+# Chip amounts are bucketed on a log scale so each fits in 10 bits.
+# Phases use game.poker_game.PHASE_CODES; GamePhase is a str enum, so its
+# keys also match the plain phase names passed in here.
+CHIP_BITS = 10
+NUM_PLAYERS_BITS = 4
+
+
+def chip_bucket(amount: int) -> int:
+    """
+    Bucket a chip amount into 10 bits on a log scale.
+    Amounts below 32 are kept exact; larger amounts keep the top 5 bits.
+    """
+    if amount <= 0:
+        return 0
+    exponent = amount.bit_length()
+    if exponent <= 5:
+        return amount
+    if exponent > 63:
+        return (1 << CHIP_BITS) - 1
+    return (exponent << 4) | ((amount >> (exponent - 5)) & 0xF)
 
 
 class CFRAgent:
     """
     Counterfactual Regret Minimization agent for poker.
     Simplified implementation for demonstration purposes.
+
+    Regrets and strategy sums are stored as contiguous ``(N, num_actions)``
+    arrays with one row per visited information set, so regret matching
+    can be applied to many information sets in a single vectorized call.
     """
     
-    def __init__(self):
-        # Store cumulative regrets and strategy for each information set
-        self.regret_sum: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(3))
-        self.strategy_sum: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(3))
+    def __init__(self, use_gpu: bool = False, initial_capacity: int = 1024):
+        if use_gpu and cupy is None:
+            raise ValueError("CuPy is required for the GPU backend")
+        self.xp = cupy if use_gpu else np
         self.num_actions = 3  # fold, call, raise
-        
-    def get_strategy(self, info_set: str) -> np.ndarray:
+        # Map information set -> row index into regret_sum / strategy_sum
+        self.info_idx: Dict[int, int] = {}
+        # Store cumulative regrets and strategy for each information set
+        self.regret_sum = self.xp.zeros((initial_capacity, self.num_actions), dtype=self.xp.float32)
+        self.strategy_sum = self.xp.zeros((initial_capacity, self.num_actions), dtype=self.xp.float32)
+
+    @property
+    def num_info_sets(self) -> int:
+        """Number of information sets visited so far."""
+        return len(self.info_idx)
+
+    def _index(self, info_set: int) -> int:
         """
-        Get current strategy for an information set using regret matching.
+        Get the row index for an information set, allocating a row if needed.
+        Storage grows by doubling so that allocation is amortized O(1).
+        """
+        idx = self.info_idx.get(info_set)
+        if idx is None:
+            idx = len(self.info_idx)
+            if idx == self.regret_sum.shape[0]:
+                self._grow()
+            self.info_idx[info_set] = idx
+        return idx
+
+    def _grow(self):
+        """Double the capacity of the regret and strategy tables."""
+        xp = self.xp
+        capacity = max(1, 2 * self.regret_sum.shape[0])
+        for name in ("regret_sum", "strategy_sum"):
+            old = getattr(self, name)
+            new = xp.zeros((capacity, self.num_actions), dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+
+    def _to_numpy(self, array) -> np.ndarray:
+        """Move an array back to host memory if the GPU backend is in use."""
+        if self.xp is np:
+            return array
+        return cupy.asnumpy(array)
+
+    def get_strategy_batch(self, idxs: Optional[Sequence[int]] = None):
+        """
+        Get current strategies for many information sets using regret matching.
         
         Args:
-            info_set: String representation of game state
+            idxs: Row indices of the information sets (all visited rows if None)
             
         Returns:
-            Strategy (probability distribution over actions)
+            Array of shape (len(idxs), num_actions) with one strategy per row
         """
-        regrets = self.regret_sum[info_set]
+        xp = self.xp
+        if idxs is None:
+            regrets = self.regret_sum[:self.num_info_sets].copy()
+        else:
+            regrets = self.regret_sum[xp.asarray(idxs, dtype=xp.intp)]
         
         # Apply regret matching
-        strategy = np.maximum(regrets, 0)
-        normalizing_sum = np.sum(strategy)
+        xp.maximum(regrets, 0, out=regrets)
+        normalizing_sum = regrets.sum(axis=1, keepdims=True)
+        positive = normalizing_sum > 0
         
-        if normalizing_sum > 0:
-            strategy = strategy / normalizing_sum
-        else:
-            # Uniform random strategy if no positive regrets
-            strategy = np.ones(self.num_actions) / self.num_actions
+        # Uniform random strategy for rows without positive regrets
+        return xp.where(
+            positive,
+            regrets / xp.where(positive, normalizing_sum, 1),
+            1.0 / self.num_actions,
+        )
+        
+    def get_strategy(self, info_set: int) -> np.ndarray:
+        """
+        Get current strategy for an information set using regret matching.
         
-        return strategy
+        Args:
+            info_set: Packed integer key of the game state
+            
+        Returns:
+            Strategy (probability distribution over actions, read-only)
+        """
+        # Unvisited information sets play uniformly; rows are only allocated on writes
+        idx = self.info_idx.get(info_set)
+        if idx is None:
+            return _UNIFORM
+        return self._to_numpy(self.get_strategy_batch([idx])[0])
     
-    def get_action(self, info_set: str) -> int:
+    def get_action(self, info_set: int) -> int:
         """
         Sample an action according to current strategy.
         
         Args:
-            info_set: String representation of game state
+            info_set: Packed integer key of the game state
             
         Returns:
             Action index (0=fold, 1=call, 2=raise)
         """
         strategy = self.get_strategy(info_set)
-        return np.random.choice(self.num_actions, p=strategy)
+        # Inverse-CDF sampling over the three actions without np.random.choice overhead
+        cum_fold = strategy[0]
+        cum_call = cum_fold + strategy[1]
+        u = _RNG.random()
+        return 0 if u < cum_fold else (1 if u < cum_call else 2)
     
-    def update_strategy(self, info_set: str):
+    def get_action_batch(self, idxs: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Sample one action per information set with a single uniform draw per row.
+        
+        Args:
+            idxs: Row indices of the information sets (all visited rows if None)
+            
+        Returns:
+            Array of action indices (0=fold, 1=call, 2=raise)
+        """
+        cumulative = self._to_numpy(self.get_strategy_batch(idxs).cumsum(axis=1))
+        u = _RNG.random((cumulative.shape[0], 1))
+        return (u >= cumulative[:, :-1]).sum(axis=1)
+    
+    def update_strategy(self, info_set: int):
         """
         Add current strategy to strategy sum for average strategy calculation.
         
         Args:
-            info_set: String representation of game state
+            info_set: Packed integer key of the game state
         """
-        strategy = self.get_strategy(info_set)
-        self.strategy_sum[info_set] += strategy
+        idx = self._index(info_set)
+        self.strategy_sum[idx] += self.get_strategy_batch([idx])[0]
+    
+    def add_deltas(self, info_sets: Sequence[int], regret_deltas: np.ndarray,
+                   strategy_deltas: np.ndarray):
+        """
+        Accumulate regret and strategy deltas for distinct information sets.
+        
+        Args:
+            info_sets: Information set keys (no duplicates)
+            regret_deltas: Array of shape (len(info_sets), num_actions)
+            strategy_deltas: Array of shape (len(info_sets), num_actions)
+        """
+        if not len(info_sets):
+            return
+        idxs = self.xp.asarray([self._index(info_set) for info_set in info_sets])
+        self.regret_sum[idxs] += self.xp.asarray(regret_deltas, dtype=self.regret_sum.dtype)
+        self.strategy_sum[idxs] += self.xp.asarray(strategy_deltas, dtype=self.strategy_sum.dtype)
+    
+    def train_parallel(self, num_iters: int, num_workers: Optional[int] = None,
+                       merge_every: int = 100, num_players: int = 2,
+                       starting_stack: int = 1000):
+        """
+        Train by self-play across worker processes (outcome-sampling MCCFR).
+        
+        Each worker plays hands against itself with a snapshot of the current
+        regrets and accumulates regret/strategy deltas in its own buffers.
+        The deltas are merged into this agent after every round of
+        merge_every hands per worker, so no shared-memory locking is needed.
+        Workers are spawned rather than forked: forking after numba's
+        parallel kernels have started their thread pool can deadlock.
+        
+        Args:
+            num_iters: Total number of self-play hands
+            num_workers: Number of processes (defaults to the CPU count)
+            merge_every: Hands each worker plays between merges
+            num_players: Players per self-play table
+            starting_stack: Starting stack for each self-play hand
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        remaining = num_iters
+        with multiprocessing.get_context("spawn").Pool(num_workers) as pool:
+            while remaining > 0:
+                snapshot = (dict(self.info_idx), self._to_numpy(self.regret_sum[:self.num_info_sets]))
+                tasks = []
+                for seed in _RNG.integers(1 << 63, size=num_workers):
+                    num_hands = min(merge_every, remaining)
+                    remaining -= num_hands
+                    if num_hands:
+                        tasks.append((snapshot, num_hands, int(seed), num_players, starting_stack))
+                for info_sets, regret_deltas, strategy_deltas in pool.map(_selfplay_worker, tasks):
+                    self.add_deltas(info_sets, regret_deltas, strategy_deltas)
     
-    def get_average_strategy(self, info_set: str) -> np.ndarray:
+    def get_average_strategy(self, info_set: int) -> np.ndarray:
         """
         Get average strategy over all iterations.
         This converges to Nash equilibrium.
         
         Args:
-            info_set: String representation of game state
+            info_set: Packed integer key of the game state
             
         Returns:
             Average strategy
         """
-        avg_strategy = self.strategy_sum[info_set]
+        idx = self.info_idx.get(info_set)
+        if idx is None:
+            return _UNIFORM
+        avg_strategy = self._to_numpy(self.strategy_sum[idx])
         normalizing_sum = np.sum(avg_strategy)
         
         if normalizing_sum > 0:
-            avg_strategy = avg_strategy / normalizing_sum
-        else:
-            avg_strategy = np.ones(self.num_actions) / self.num_actions
+            return avg_strategy / normalizing_sum
+        return _UNIFORM
+
+
+# Field extractors for the game state fields read on every decision
+_STATE_FIELDS = itemgetter("phase", "pot", "current_bet", "players")
+_PLAYER_FIELDS = itemgetter("stack", "bet")
+
+
+@lru_cache(maxsize=65536)
+def _map_action_cached(action_idx: int, current_bet: int, player_bet: int,
+                       player_stack: int, pot: int, aggression_level: float) -> Tuple[str, int]:
+    """
+    Map CFR action index to poker action.
+    Pure function of its integer inputs, so results are memoized.
+    
+    Args:
+        action_idx: Action index from CFR (0=fold, 1=call, 2=raise)
+        current_bet: Current bet to match
+        player_bet: Player's current bet
+        player_stack: Player's remaining stack
+        pot: Current pot size
+        aggression_level: AI aggression (0.0 to 1.0)
         
-        return avg_strategy
+    Returns:
+        Tuple of (action_type, amount)
+    """
+    if action_idx == 0:
+        # Fold (but check if we can check instead)
+        if player_bet >= current_bet:
+            return ("check", 0)
+        return ("fold", 0)
+    
+    elif action_idx == 1:
+        # Call
+        call_amount = min(current_bet - player_bet, player_stack)
+        if call_amount == 0:
+            return ("check", 0)
+        return ("call", 0)
+    
+    else:  # action_idx == 2
+        # Raise
+        # Calculate raise size (pot-sized raise by default)
+        if current_bet == 0:
+            # Bet
+            bet_size = int(pot * (0.5 + aggression_level * 0.5))
+            bet_size = min(bet_size, player_stack)
+            if bet_size > 0:
+                return ("bet", bet_size)
+            return ("check", 0)
+        else:
+            # Raise
+            raise_size = int(current_bet * (2 + aggression_level))
+            raise_size = min(raise_size, player_stack)
+            if raise_size >= current_bet * 2:
+                return ("raise", raise_size)
+            # If can't raise, call instead
+            call_amount = min(current_bet - player_bet, player_stack)
+            if call_amount == 0:
+                return ("check", 0)
+            return ("call", 0)
 
 
 class PokerAI:
@@ -103,7 +345,7 @@ class PokerAI:
         Make a decision based on current game state.
         
         Args:
-            game_state: Current game state dictionary
+            game_state: Current game state dictionary (as returned by PokerGame.get_state)
             
         Returns:
             Tuple of (action_type, amount)
@@ -112,8 +354,13 @@ class PokerAI:
         if not player:
             return ("fold", 0)
         
+        # Read every field needed for this decision exactly once
+        phase, pot, current_bet, players = _STATE_FIELDS(game_state)
+        player_stack, player_bet = _PLAYER_FIELDS(player)
+        num_players = sum(1 for p in players if not p["has_folded"])
+        
         # Create information set from game state
-        info_set = self._create_info_set(game_state, player)
+        info_set = self._create_info_set(phase, pot, current_bet, player_stack, player_bet, num_players)
         
         # Get action from CFR agent
         action_idx = self.cfr_agent.get_action(info_set)
@@ -122,7 +369,7 @@ class PokerAI:
         self.cfr_agent.update_strategy(info_set)
         
         # Map action index to poker action
-        return self._map_action(action_idx, game_state, player)
+        return self._map_action(action_idx, current_bet, player_bet, player_stack, pot)
     
     def _find_player(self, game_state: Dict, player_id: str) -> Optional[Dict]:
         """Find player in game state."""
@@ -131,101 +378,470 @@ class PokerAI:
                 return player
         return None
     
-    def _create_info_set(self, game_state: Dict, player: Dict) -> str:
+    @staticmethod
+    def _create_info_set(phase: str, pot: int, current_bet: int,
+                         player_stack: int, player_bet: int, num_players: int) -> int:
         """
-        Create information set string from game state.
-        Simplified version using basic features.
+        Create information set key from game state features.
+        Simplified version using basic features packed into one integer.
         
         Args:
-            game_state: Current game state
-            player: Player dictionary
+            phase: Game phase name
+            pot: Current pot size
+            current_bet: Current bet to match
+            player_stack: Player's remaining stack
+            player_bet: Player's current bet
+            num_players: Number of players who have not folded
             
         Returns:
-            Information set string
+            Information set key
         """
-        # Extract relevant features
-        phase = game_state.get("phase", "preflop")
-        pot = game_state.get("pot", 0)
-        current_bet = game_state.get("current_bet", 0)
-        player_stack = player.get("stack", 0)
-        player_bet = player.get("bet", 0)
-        num_players = len([p for p in game_state.get("players", []) if not p.get("has_folded")])
+        num_players = min(num_players, (1 << NUM_PLAYERS_BITS) - 1)
         
         # Simplified info set (in real implementation, would include cards)
-        info_set = f"{phase}_{pot}_{current_bet}_{player_stack}_{player_bet}_{num_players}"
-        return info_set
+        info_set = PHASE_CODES.get(phase, 0)
+        for amount in (pot, current_bet, player_stack, player_bet):
+            info_set = (info_set << CHIP_BITS) | chip_bucket(amount)
+        return (info_set << NUM_PLAYERS_BITS) | num_players
     
-    def _map_action(self, action_idx: int, game_state: Dict, player: Dict) -> Tuple[str, int]:
+    def _map_action(self, action_idx: int, current_bet: int, player_bet: int,
+                    player_stack: int, pot: int) -> Tuple[str, int]:
         """
         Map CFR action index to poker action.
         
         Args:
             action_idx: Action index from CFR (0=fold, 1=call, 2=raise)
-            game_state: Current game state
-            player: Player dictionary
+            current_bet: Current bet to match
+            player_bet: Player's current bet
+            player_stack: Player's remaining stack
+            pot: Current pot size
             
         Returns:
             Tuple of (action_type, amount)
         """
-        current_bet = game_state.get("current_bet", 0)
-        player_bet = player.get("bet", 0)
-        player_stack = player.get("stack", 0)
+        return _map_action_cached(action_idx, current_bet, player_bet, player_stack, pot,
+                                  self.aggression_level)
+
+
+# Safety cap on actions per self-play hand
+_MAX_SELFPLAY_ACTIONS = 200
+
+
+def _outcome_regret(strategy: np.ndarray, action_idx: int, payoff: float,
+                    reach: float = 1.0) -> np.ndarray:
+    """
+    Sampled regret of each action at a decision where action_idx was sampled.
+    
+    With on-policy sampling the opponents' and chance reach cancel against
+    the sampling probability, leaving the acting player's own reach pi_i(h).
+    
+    Args:
+        strategy: Strategy the action was sampled from
+        action_idx: Action that was sampled
+        payoff: Chips the acting player won (u)
+        reach: Acting player's own probability of reaching this decision (pi_i(h))
         
-        if action_idx == 0:
-            # Fold (but check if we can check instead)
-            if player_bet >= current_bet:
-                return ("check", 0)
-            return ("fold", 0)
+    Returns:
+        Regret per action: (u / s[a] - u) / pi_i(h) for the sampled action,
+        -u / pi_i(h) for the rest
+    """
+    regret = np.full(len(strategy), -float(payoff))
+    regret[action_idx] += payoff / strategy[action_idx]
+    return regret / reach
+
+
+def _selfplay_hand(agent: CFRAgent, rng: np.random.Generator, num_players: int,
+                   starting_stack: int, regret_deltas: Dict[int, np.ndarray],
+                   strategy_deltas: Dict[int, np.ndarray]):
+    """
+    Play one self-play hand and accumulate outcome-sampling MCCFR updates.
+    
+    Every seat samples from the current strategy, so the probability of
+    sampling a history h is its reach pi(h) = pi_i(h) * pi_-i(h). For a
+    decision at info set I where action a was sampled with probability s[a]
+    and the acting player i won u chips, the sampled counterfactual value of
+    a' is u / (pi_i(h) * s[a]) if a' == a else 0, and the regret update is
+    that value minus u / pi_i(h). The average strategy gains
+    pi_i(h) * s / pi(h) = s / pi_-i(h), an unbiased sample of the
+    reach-weighted sum pi_i(h) * s.
+    
+    When the sampled action is illegal here, the passive check/call is
+    played in its place; the update still credits the sampled action,
+    which is what the strategy chose and with what probability.
+    """
+    game = PokerGame("selfplay", num_players, 5, 10, starting_stack)
+    for seat in range(num_players):
+        game.add_player(f"selfplay-{seat}")
+    game.start_new_hand()
+    
+    decisions = []
+    # Product of each seat's own action probabilities so far (pi_i(h))
+    reach = np.ones(num_players)
+    for _ in range(_MAX_SELFPLAY_ACTIONS):
+        if game.phase == GamePhase.FINISHED:
+            break
+        player = game.players[game.current_player_index]
+        num_live = sum(1 for p in game.players if not p.has_folded)
+        info_set = PokerAI._create_info_set(game.phase.value, game.pot, game.current_bet,
+                                            player.stack, player.bet, num_live)
+        strategy = agent.get_strategy(info_set)
+        u = rng.random()
+        action_idx = 0 if u < strategy[0] else (1 if u < strategy[0] + strategy[1] else 2)
+        if strategy[action_idx] == 0:
+            # u fell in the rounding gap above the float32 cumulative sum
+            action_idx = int(np.flatnonzero(strategy)[-1])
+        seat = game.current_player_index
+        own_reach = reach[seat]
+        opponent_reach = reach.prod() / own_reach
         
-        elif action_idx == 1:
-            # Call
-            call_amount = min(current_bet - player_bet, player_stack)
-            if call_amount == 0:
-                return ("check", 0)
-            return ("call", 0)
+        action_type, amount = _map_action_cached(action_idx, game.current_bet, player.bet,
+                                                 player.stack, game.pot, 0.5)
+        try:
+            game.process_action(player.player_id, action_type, amount)
+        except ValueError:
+            # Fall back to the passive action (check/call) when the mapped one is illegal
+            fallback = "check" if player.bet >= game.current_bet else "call"
+            try:
+                game.process_action(player.player_id, fallback, 0)
+            except ValueError:
+                return
+        decisions.append((seat, info_set, action_idx, strategy, own_reach, opponent_reach))
+        reach[seat] *= strategy[action_idx]
+    else:
+        # Hit the action cap without finishing the hand; discard it
+        return
+    
+    for seat, info_set, action_idx, strategy, own_reach, opponent_reach in decisions:
+        regret = _outcome_regret(strategy, action_idx, game.players[seat].stack - starting_stack,
+                                 own_reach)
+        weighted_strategy = strategy / opponent_reach
+        if info_set in regret_deltas:
+            regret_deltas[info_set] += regret
+            strategy_deltas[info_set] += weighted_strategy
+        else:
+            regret_deltas[info_set] = regret
+            strategy_deltas[info_set] = weighted_strategy
+
+
+def _selfplay_worker(task) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """Play a batch of self-play hands in a worker process and return the deltas."""
+    (info_idx, regrets), num_hands, seed, num_players, starting_stack = task
+    agent = CFRAgent(initial_capacity=max(1, len(regrets)))
+    agent.info_idx = info_idx
+    agent.regret_sum[:len(regrets)] = regrets
+    
+    # Give each worker its own stream for the shared generators
+    seed_rng(seed)
+    rng = np.random.default_rng(seed)
+    
+    regret_deltas: Dict[int, np.ndarray] = {}
+    strategy_deltas: Dict[int, np.ndarray] = {}
+    for _ in range(num_hands):
+        _selfplay_hand(agent, rng, num_players, starting_stack, regret_deltas, strategy_deltas)
+    
+    info_sets = list(regret_deltas)
+    shape = (len(info_sets), agent.num_actions)
+    return (
+        info_sets,
+        np.array([regret_deltas[k] for k in info_sets]).reshape(shape),
+        np.array([strategy_deltas[k] for k in info_sets]).reshape(shape),
+    )
+
+
+# Hand scores are category << 20 followed by up to five 4-bit rank nibbles
+HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, \
+    FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = range(9)
+
+
+@njit(cache=True)
+def _top_ranks(mask, n):
+    """Pack the n highest ranks set in a 13-bit rank mask into 4-bit nibbles."""
+    packed = 0
+    taken = 0
+    for r in range(12, -1, -1):
+        if taken == n:
+            break
+        if (mask >> r) & 1:
+            packed = (packed << 4) | r
+            taken += 1
+    return packed << (4 * (n - taken))
+
+
+@njit(cache=True)
+def _straight_high(mask):
+    """Return the top rank of the best straight in a rank mask, or -1."""
+    # Shift ranks up one bit and copy the ace into bit 0 for the wheel
+    m = (mask << 1) | ((mask >> 12) & 1)
+    runs = m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4)
+    for low in range(9, -1, -1):
+        if (runs >> low) & 1:
+            return low + 3
+    return -1
+
+
+@njit(cache=True)
+def evaluate_u8(cards):
+    """
+    Evaluate the best 5-card hand out of up to 7 encoded cards.
+    
+    Args:
+        cards: uint8 array of card indices (rank * 4 + suit)
         
-        else:  # action_idx == 2
-            # Raise
-            pot = game_state.get("pot", 0)
-            
-            # Calculate raise size (pot-sized raise by default)
-            if current_bet == 0:
-                # Bet
-                bet_size = int(pot * (0.5 + self.aggression_level * 0.5))
-                bet_size = min(bet_size, player_stack)
-                if bet_size > 0:
-                    return ("bet", bet_size)
-                return ("check", 0)
-            else:
-                # Raise
-                raise_size = int(current_bet * (2 + self.aggression_level))
-                raise_size = min(raise_size, player_stack)
-                if raise_size >= current_bet * 2:
-                    return ("raise", raise_size)
-                # If can't raise, call instead
-                call_amount = min(current_bet - player_bet, player_stack)
-                if call_amount == 0:
-                    return ("check", 0)
-                return ("call", 0)
+    Returns:
+        Hand score (higher is better)
+    """
+    rank_counts = np.zeros(13, np.int32)
+    suit_counts = np.zeros(4, np.int32)
+    suit_masks = np.zeros(4, np.int32)
+    rank_mask = 0
+    for i in range(cards.shape[0]):
+        card = int(cards[i])
+        rank = card >> 2
+        suit = card & 3
+        rank_counts[rank] += 1
+        suit_counts[suit] += 1
+        suit_masks[suit] |= 1 << rank
+        rank_mask |= 1 << rank
+
+    flush_mask = 0
+    for suit in range(4):
+        if suit_counts[suit] >= 5:
+            flush_mask = suit_masks[suit]
+    if flush_mask:
+        high = _straight_high(flush_mask)
+        if high >= 0:
+            return (STRAIGHT_FLUSH << 20) | (high << 16)
+
+    quad = -1
+    trip = -1
+    pair1 = -1
+    pair2 = -1
+    for r in range(12, -1, -1):
+        count = rank_counts[r]
+        if count == 4 and quad < 0:
+            quad = r
+        elif count == 3:
+            if trip < 0:
+                trip = r
+            elif pair1 < 0:
+                pair1 = r  # A second set plays as the pair of a full house
+        elif count == 2:
+            if pair1 < 0:
+                pair1 = r
+            elif pair2 < 0:
+                pair2 = r
+
+    if quad >= 0:
+        return (FOUR_OF_A_KIND << 20) | (quad << 16) | (_top_ranks(rank_mask & ~(1 << quad), 1) << 12)
+    if trip >= 0 and pair1 >= 0:
+        return (FULL_HOUSE << 20) | (trip << 16) | (pair1 << 12)
+    if flush_mask:
+        return (FLUSH << 20) | _top_ranks(flush_mask, 5)
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return (STRAIGHT << 20) | (high << 16)
+    if trip >= 0:
+        return (THREE_OF_A_KIND << 20) | (trip << 16) | (_top_ranks(rank_mask & ~(1 << trip), 2) << 8)
+    if pair2 >= 0:
+        kicker = _top_ranks(rank_mask & ~(1 << pair1) & ~(1 << pair2), 1)
+        return (TWO_PAIR << 20) | (pair1 << 16) | (pair2 << 12) | (kicker << 8)
+    if pair1 >= 0:
+        return (ONE_PAIR << 20) | (pair1 << 16) | (_top_ranks(rank_mask & ~(1 << pair1), 3) << 4)
+    return (HIGH_CARD << 20) | _top_ranks(rank_mask, 5)
+
+
+@njit(parallel=True, cache=True)
+def simulate_equity(hole, board, dead, n_trials, num_opponents=1):
+    """
+    Estimate equity by Monte Carlo, with trials run in parallel.
+    
+    Args:
+        hole: uint8 array of the player's two card indices
+        board: uint8 array of the community cards dealt so far
+        dead: uint8 array of other cards known to be out of the deck
+        n_trials: Number of Monte Carlo run-outs
+        num_opponents: Number of opponents with random hole cards
+        
+    Returns:
+        Win probability (0.0 to 1.0), counting ties as half a win
+    """
+    known = np.zeros(52, np.bool_)
+    for i in range(hole.shape[0]):
+        known[hole[i]] = True
+    for i in range(board.shape[0]):
+        known[board[i]] = True
+    for i in range(dead.shape[0]):
+        known[dead[i]] = True
+    remaining = np.empty(52 - known.sum(), np.uint8)
+    n = 0
+    for card in range(52):
+        if not known[card]:
+            remaining[n] = card
+            n += 1
+
+    n_board = board.shape[0]
+    board_needed = 5 - n_board
+    num_drawn = board_needed + 2 * num_opponents
+    results = np.empty(n_trials, np.float64)
+    for t in prange(n_trials):
+        # Partial Fisher-Yates: only the cards this run-out needs
+        deck = remaining.copy()
+        for i in range(num_drawn):
+            j = i + np.random.randint(0, n - i)
+            card = deck[i]
+            deck[i] = deck[j]
+            deck[j] = card
+
+        cards = np.empty(7, np.uint8)
+        for i in range(n_board):
+            cards[2 + i] = board[i]
+        for i in range(board_needed):
+            cards[2 + n_board + i] = deck[i]
+        cards[0] = hole[0]
+        cards[1] = hole[1]
+        hero = evaluate_u8(cards)
+
+        best = 0
+        for o in range(num_opponents):
+            cards[0] = deck[board_needed + 2 * o]
+            cards[1] = deck[board_needed + 2 * o + 1]
+            best = max(best, evaluate_u8(cards))
+
+        if hero > best:
+            results[t] = 1.0
+        elif hero == best:
+            results[t] = 0.5
+        else:
+            results[t] = 0.0
+    return results.mean()
+
+
+# Index of the highest set bit for every 14-bit mask (-1 for an empty mask)
+_HIGHEST_BIT = np.array([x.bit_length() - 1 for x in range(1 << 14)], dtype=np.int32)
+_RANK_BITS = np.int32(1) << np.arange(13, dtype=np.int32)
+
+
+def _top_ranks_batch(masks: np.ndarray, n: int) -> np.ndarray:
+    """Vectorized _top_ranks over an array of rank masks."""
+    packed = np.zeros_like(masks)
+    for _ in range(n):
+        high = _HIGHEST_BIT[masks]
+        present = high >= 0
+        packed = (packed << 4) | np.where(present, high, 0)
+        masks = np.where(present, masks & ~(1 << np.maximum(high, 0)), masks)
+    return packed
+
+
+def _straight_high_batch(masks: np.ndarray) -> np.ndarray:
+    """Vectorized _straight_high over an array of rank masks."""
+    m = (masks << 1) | ((masks >> 12) & 1)
+    runs = m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4)
+    high = _HIGHEST_BIT[runs]
+    return np.where(high >= 0, high + 3, -1)
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Evaluate many hands at once; row-wise equivalent to evaluate_u8.
+    
+    Args:
+        cards: uint8 array of shape (K, n) with card indices (rank * 4 + suit)
+        
+    Returns:
+        int32 array of K hand scores
+    """
+    ranks = (cards >> 2).astype(np.int32)
+    suits = (cards & 3).astype(np.int32)
+    rank_bits = np.int32(1) << ranks
+    rank_counts = (ranks[:, :, None] == np.arange(13)).sum(axis=1)
+    rank_mask = np.bitwise_or.reduce(rank_bits, axis=1)
+
+    # At most one suit can hold five of seven cards
+    in_suit = suits[:, :, None] == np.arange(4)
+    suit_masks = np.bitwise_or.reduce(np.where(in_suit, rank_bits[:, :, None], 0), axis=1)
+    flush_mask = np.where(in_suit.sum(axis=1) >= 5, suit_masks, 0).max(axis=1)
+
+    def rank_set(count: int) -> np.ndarray:
+        return np.where(rank_counts == count, _RANK_BITS, 0).sum(axis=1)
+
+    quad_mask, trip_mask, pair_mask = rank_set(4), rank_set(3), rank_set(2)
+    quad = _HIGHEST_BIT[quad_mask]
+    trip = _HIGHEST_BIT[trip_mask]
+    # A second set plays as the pair of a full house
+    full_house_pair = _HIGHEST_BIT[pair_mask | (trip_mask & ~(1 << np.maximum(trip, 0)))]
+    pair1 = _HIGHEST_BIT[pair_mask]
+    pair2 = _HIGHEST_BIT[pair_mask & ~(1 << np.maximum(pair1, 0))]
+    straight_flush = _straight_high_batch(flush_mask)
+    straight = _straight_high_batch(rank_mask)
+
+    def without(*ranks_out: np.ndarray) -> np.ndarray:
+        mask = rank_mask
+        for r in ranks_out:
+            mask = mask & ~(1 << np.maximum(r, 0))
+        return mask
+
+    return np.select(
+        [
+            (flush_mask > 0) & (straight_flush >= 0),
+            quad >= 0,
+            (trip >= 0) & (full_house_pair >= 0),
+            flush_mask > 0,
+            straight >= 0,
+            trip >= 0,
+            pair2 >= 0,
+            pair1 >= 0,
+        ],
+        [
+            (STRAIGHT_FLUSH << 20) | (straight_flush << 16),
+            (FOUR_OF_A_KIND << 20) | (quad << 16) | (_top_ranks_batch(without(quad), 1) << 12),
+            (FULL_HOUSE << 20) | (trip << 16) | (full_house_pair << 12),
+            (FLUSH << 20) | _top_ranks_batch(flush_mask, 5),
+            (STRAIGHT << 20) | (straight << 16),
+            (THREE_OF_A_KIND << 20) | (trip << 16) | (_top_ranks_batch(without(trip), 2) << 8),
+            (TWO_PAIR << 20) | (pair1 << 16) | (pair2 << 12) | (_top_ranks_batch(without(pair1, pair2), 1) << 8),
+            (ONE_PAIR << 20) | (pair1 << 16) | (_top_ranks_batch(without(pair1), 3) << 4),
+        ],
+        default=(HIGH_CARD << 20) | _top_ranks_batch(rank_mask, 5),
+    ).astype(np.int32)
+
+
+def batch_runouts(known_cards: np.ndarray, n_needed: int, n_trials: int = 1000) -> np.ndarray:
+    """
+    Sample many run-outs of unseen cards in one vectorized call.
+    
+    Args:
+        known_cards: Card indices already out of the deck
+        n_needed: Number of cards to draw per run-out
+        n_trials: Number of run-outs
+        
+    Returns:
+        uint8 array of shape (n_trials, n_needed); cards within a row are distinct
+    """
+    remaining = np.setdiff1d(np.arange(52, dtype=np.uint8), known_cards)
+    if n_needed > len(remaining):
+        raise ValueError("Not enough cards in deck")
+    if n_needed == 0:
+        return np.empty((n_trials, 0), dtype=np.uint8)
+    # Draw without replacement: take the smallest random keys of the unseen cards
+    keys = _RNG.random((n_trials, len(remaining)))
+    return remaining[np.argpartition(keys, n_needed - 1, axis=1)[:, :n_needed]]
 
 
 class HandEvaluator:
     """
-    Simplified hand evaluator using NumPy.
-    In production, use a library like pokereval or treys.
+    Hand evaluator using NumPy, JIT-compiled with numba when available.
     """
     
-    RANK_VALUES = {
-        '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, 
-        '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-    }
+    @staticmethod
+    def encode_cards(cards: List[str]) -> np.ndarray:
+        """Encode card strings (e.g., ['As', 'Kh']) as a uint8 index array."""
+        return np.array([CARD_INDEX[card] for card in cards], dtype=np.uint8)
     
     @staticmethod
     def evaluate_hand(hole_cards: List[str], community_cards: List[str]) -> int:
         """
         Evaluate hand strength.
         Returns a numerical score (higher is better).
-        Simplified implementation.
         
         Args:
             hole_cards: Player's hole cards (e.g., ['As', 'Kh'])
@@ -239,35 +855,45 @@ class HandEvaluator:
         if len(all_cards) < 2:
             return 0
         
-        # Extract ranks and suits
-        ranks = [card[0] for card in all_cards]
-        suits = [card[1] for card in all_cards]
-        
-        # Convert to numerical values
-        rank_values = [HandEvaluator.RANK_VALUES.get(r, 0) for r in ranks]
-        
-        # Simple evaluation based on high card
-        # In real implementation, would check for pairs, straights, flushes, etc.
-        return max(rank_values) if rank_values else 0
+        return int(evaluate_u8(HandEvaluator.encode_cards(all_cards)))
     
     @staticmethod
     def calculate_hand_strength(hole_cards: List[str], community_cards: List[str], 
-                                num_opponents: int = 1) -> float:
+                                num_opponents: int = 1, num_simulations: int = 1000) -> float:
         """
         Calculate hand strength using Monte Carlo simulation.
-        Simplified version.
+        All rollouts are sampled and evaluated as one batch.
         
         Args:
             hole_cards: Player's hole cards
             community_cards: Community cards
             num_opponents: Number of opponents
+            num_simulations: Number of Monte Carlo rollouts
             
         Returns:
-            Win probability (0.0 to 1.0)
+            Win probability (0.0 to 1.0), counting ties as half a win
         """
-        # Simplified: just evaluate current hand
-        score = HandEvaluator.evaluate_hand(hole_cards, community_cards)
+        if len(hole_cards) < 2 or num_opponents < 1:
+            return 0.0
+        
+        hole = HandEvaluator.encode_cards(hole_cards)
+        board = HandEvaluator.encode_cards(community_cards)
+        board_needed = 5 - len(board)
+        num_drawn = board_needed + 2 * num_opponents
+        
+        drawn = batch_runouts(np.concatenate([hole, board]), num_drawn, num_simulations)
+        
+        boards = np.concatenate(
+            [np.broadcast_to(board, (num_simulations, len(board))), drawn[:, :board_needed]], axis=1
+        )
+        hero = evaluate_batch(np.concatenate(
+            [np.broadcast_to(hole, (num_simulations, 2)), boards], axis=1
+        ))
+        
+        opponent_holes = drawn[:, board_needed:].reshape(num_simulations, num_opponents, 2)
+        opponent_boards = np.broadcast_to(boards[:, None, :], (num_simulations, num_opponents, 5))
+        opponents = evaluate_batch(
+            np.concatenate([opponent_holes, opponent_boards], axis=2).reshape(-1, 7)
+        ).reshape(num_simulations, num_opponents).max(axis=1)
         
-        # Normalize to probability
-        max_score = 14  # Ace
-        return min(score / max_score, 1.0)
+        return float(np.mean((hero > opponents) + 0.5 * (hero == opponents)))
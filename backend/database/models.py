@@ -2,7 +2,7 @@
 Database models for PostgreSQL using SQLAlchemy.
 Optional feature for hand history storage.
 """
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, Boolean, ForeignKey, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -57,6 +57,14 @@ class Action(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     hand = relationship("Hand", back_populates="actions")
+    
+    __table_args__ = (
+        Index("ix_actions_hand_phase", "hand_id", "phase"),
+        Index("ix_actions_player", "player_id"),
+        # Voluntary money-in-pot actions, for VPIP/PFR aggregation
+        Index("ix_actions_vpip", "player_id",
+              postgresql_where=text("action_type IN ('call', 'raise', 'bet')")),
+    )
 
 
 class HandResult(Base):
@@ -74,6 +82,10 @@ class HandResult(Base):
     won = Column(Boolean, default=False)
     
     hand = relationship("Hand", back_populates="results")
+    
+    __table_args__ = (
+        Index("ix_handresults_player_won", "player_id", "won"),
+    )
 
 
 class Player(Base):
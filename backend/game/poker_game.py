@@ -1,60 +1,160 @@
 """
 Core poker game logic for 9-max No Limit Hold'em.
 """
-import random
+import copy
+import sys
+import time
 import uuid
+from datetime import datetime, timezone
+import numpy as np
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from models.game_state import (
     GamePhase, ActionType, PlayerState, GameStateResponse
 )
 
 
+# Shared PCG64 generator used for shuffling
+_RNG = np.random.default_rng()
+
+
+def seed_rng(seed: Optional[int] = None):
+    """Reseed the shared shuffling generator (e.g. per worker process)."""
+    global _RNG
+    _RNG = np.random.default_rng(seed)
+
+# Shared empty hand for players without hole cards
+_NO_CARDS = np.empty(0, dtype=np.uint8)
+_NO_CARDS.setflags(write=False)
+
+# One row of the per-hand action log
+ACTION_DTYPE = np.dtype([
+    ("player_idx", "u1"),  # seat index
+    ("action", "u1"),  # index into ActionType
+    ("phase", "u1"),  # index into GamePhase
+    ("amount", "i8"),
+    ("ts_ns", "i8"),  # time.time_ns()
+])
+ACTION_CODES = {action: code for code, action in enumerate(ActionType)}
+PHASE_CODES = {phase: code for code, phase in enumerate(GamePhase)}
+_ACTION_TYPES = list(ActionType)
+_MAX_AMOUNT = np.iinfo(ACTION_DTYPE["amount"]).max
+
+
+def _coerce_amount(amount) -> int:
+    """Validate a client-supplied chip amount as an int that fits the action log."""
+    if amount is None:
+        return 0
+    try:
+        value = int(amount)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Amount must be an integer") from None
+    if abs(value) > _MAX_AMOUNT:
+        raise ValueError("Amount out of range")
+    return value
+
+
+def _utc_isoformat(ts_ns: int) -> str:
+    """Format a time.time_ns() value like datetime.utcnow().isoformat()."""
+    return datetime.fromtimestamp(ts_ns / 1e9, timezone.utc).replace(tzinfo=None).isoformat()
+
+# Bit value of each seat, for unpacking seat bitmasks into boolean arrays
+_SEAT_BITS = np.int64(1) << np.arange(63, dtype=np.int64)
+
+
 class Card:
-    """Represents a playing card."""
+    """
+    Represents a playing card.
+    The engine itself passes cards around as indices (rank * 4 + suit);
+    Card is a convenience adapter for readable construction and display.
+    """
     RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
     SUITS = ['c', 'd', 'h', 's']  # clubs, diamonds, hearts, spades
+    __slots__ = ('rank', 'suit', 'idx')
     
     def __init__(self, rank: str, suit: str):
         self.rank = rank
         self.suit = suit
+        # Dense index (rank * 4 + suit) used by the hand evaluator
+        self.idx = Card.RANKS.index(rank) * 4 + Card.SUITS.index(suit)
     
+    @classmethod
+    def from_idx(cls, idx: int) -> "Card":
+        """Create a card from its dense index (rank * 4 + suit)."""
+        idx = int(idx)
+        return cls(cls.RANKS[idx >> 2], cls.SUITS[idx & 3])
+    
+    def __eq__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.idx == other.idx
+
+    def __hash__(self):
+        return self.idx
+
     def __str__(self):
-        return f"{self.rank}{self.suit}"
+        return CARD_STRS[self.idx]
     
     def __repr__(self):
         return str(self)
 
 
+# Interned string for every card, indexed by Card.idx
+CARD_STRS: List[str] = [sys.intern(rank + suit) for rank in Card.RANKS for suit in Card.SUITS]
+# Card string -> index (rank * 4 + suit), the inverse of CARD_STRS
+CARD_INDEX: Dict[str, int] = {card: idx for idx, card in enumerate(CARD_STRS)}
+
+# Unshuffled deck, built once and copied into each new Deck
+_DECK_PROTO = np.arange(52, dtype=np.uint8)
+_DECK_PROTO.setflags(write=False)
+
+
 class Deck:
-    """52-card deck."""
+    """52-card deck stored as card indices (rank * 4 + suit)."""
     
     def __init__(self):
-        self.cards = [Card(rank, suit) for suit in Card.SUITS for rank in Card.RANKS]
+        self._deck = _DECK_PROTO.copy()
+        self._cursor = 0
         self.shuffle()
     
+    @property
+    def cards(self) -> np.ndarray:
+        """Cards remaining in the deck."""
+        return self._deck[self._cursor:]
+    
     def shuffle(self):
-        random.shuffle(self.cards)
+        _RNG.shuffle(self._deck[self._cursor:])
+    
+    def reset(self):
+        """Return all cards to the deck and shuffle, reusing the same buffer."""
+        self._cursor = 0
+        self.shuffle()
     
-    def deal(self, n: int = 1) -> List[Card]:
-        """Deal n cards from the deck."""
-        if n > len(self.cards):
+    def deal(self, n: int = 1) -> np.ndarray:
+        """Deal n cards from the deck as a view of card indices."""
+        if n > len(self._deck) - self._cursor:
             raise ValueError("Not enough cards in deck")
-        dealt = self.cards[:n]
-        self.cards = self.cards[n:]
-        return dealt
+        start = self._cursor
+        self._cursor += n
+        return self._deck[start:self._cursor]
+
+
+def _with_bit(mask: int, bit: int, on: bool) -> int:
+    """Return mask with bit set or cleared."""
+    return mask | bit if on else mask & ~bit
 
 
 class Player:
     """Represents a player at the poker table."""
+    __slots__ = ('player_id', 'name', 'stack', 'position', 'hole_cards',
+                 'bet', 'is_active', 'has_folded', 'is_all_in')
     
     def __init__(self, player_id: str, name: str, stack: int, position: int):
         self.player_id = player_id
         self.name = name
         self.stack = stack
         self.position = position
-        self.hole_cards: List[Card] = []
+        self.hole_cards: np.ndarray = _NO_CARDS
         self.bet = 0
         self.is_active = True
         self.has_folded = False
@@ -62,7 +162,7 @@ class Player:
     
     def reset_for_new_hand(self):
         """Reset player state for a new hand."""
-        self.hole_cards = []
+        self.hole_cards = _NO_CARDS
         self.bet = 0
         self.has_folded = False
         self.is_all_in = False
@@ -78,7 +178,7 @@ class Player:
             "bet": self.bet,
             "position": self.position,
             "is_active": self.is_active,
-            "hole_cards": [str(card) for card in self.hole_cards] if show_cards else None,
+            "hole_cards": [CARD_STRS[card] for card in self.hole_cards] if show_cards else None,
             "has_folded": self.has_folded,
             "is_all_in": self.is_all_in
         }
@@ -86,6 +186,18 @@ class Player:
 
 class PokerGame:
     """Main poker game manager for 9-max NLHE."""
+    __slots__ = (
+        'table_id', 'max_players', 'small_blind', 'big_blind', 'starting_stack',
+        'players', 'players_by_id',
+        '_bet', '_in_hand_mask', '_unfolded_mask', '_active_mask',
+        '_seat_bits', '_seat_bets', '_later_seats',
+        'deck', '_community', '_n_community', '_community_str',
+        'pot', 'current_bet', 'last_raise_size', 'phase', 'dealer_position',
+        'current_player_index', 'betting_round_start_index', 'last_raiser_index',
+        'bb_has_acted_preflop', 'hand_id', '_hand_counter', '_action_buf', '_action_n',
+        '_sb_idx', '_bb_idx', '_utg_idx',
+        '_state_version', '_state_cache', '_state_cache_version',
+    )
     
     def __init__(self, table_id: str, max_players: int, small_blind: int, 
                  big_blind: int, starting_stack: int):
@@ -96,8 +208,19 @@ class PokerGame:
         self.starting_stack = starting_stack
         
         self.players: List[Player] = []
+        self.players_by_id: Dict[str, Player] = {}
+        # Per-seat mirror of the fields read by the betting predicates:
+        # bets as an array, flags as bitmasks (bit i = seat i)
+        self._bet = np.zeros(max_players, dtype=np.int64)
+        self._in_hand_mask = 0  # not folded and not all-in
+        self._unfolded_mask = 0  # not folded
+        self._active_mask = 0  # is_active
+        self._specialize_for_seat_count()
         self.deck: Optional[Deck] = None
-        self.community_cards: List[Card] = []
+        # Community cards as card indices in a fixed 5-card buffer
+        self._community = np.zeros(5, dtype=np.uint8)
+        self._n_community = 0
+        self._community_str: List[str] = []  # Display strings of the community cards
         self.pot = 0
         self.current_bet = 0
         self.last_raise_size = 0  # Track the size of the last raise (for minimum raise calculation)
@@ -108,12 +231,34 @@ class PokerGame:
         self.last_raiser_index = None  # Track the last player who raised/bet (for round completion)
         self.bb_has_acted_preflop = False  # Track if BB has acted in preflop (after posting blind)
         self.hand_id = None
-        self.action_history = []
+        self._hand_counter = 0  # Hands started at this table, for hand ids
+        # Preallocated action log for the current hand, grown by doubling
+        self._action_buf = np.empty(256, dtype=ACTION_DTYPE)
+        self._action_n = 0
+        # Seats of the small blind, big blind and first preflop actor for the current button position
+        self._sb_idx = -1
+        self._bb_idx = -1
+        self._utg_idx = -1
+        # get_state() results are memoized per requester until the state changes
+        self._state_version = 0
+        self._state_cache: Dict[Optional[str], Dict] = {}
+        self._state_cache_version = -1
     
+    def __deepcopy__(self, memo: Dict) -> "PokerGame":
+        """Deep-copy the game, re-deriving the views into its per-seat arrays."""
+        clone = PokerGame.__new__(PokerGame)
+        memo[id(self)] = clone
+        for name in self.__slots__:
+            setattr(clone, name, copy.deepcopy(getattr(self, name), memo))
+        # Copied views no longer alias the copied _bet array
+        clone._specialize_for_seat_count()
+        return clone
+
     def add_player(self, name: str) -> Optional[str]:
         """Add a new player to the table."""
         if len(self.players) >= self.max_players:
             return None
+        self._state_version += 1
 
         player_id = str(uuid.uuid4())
         position = len(self.players)
@@ -124,30 +269,92 @@ class PokerGame:
             player.is_active = False
 
         self.players.append(player)
+        self.players_by_id[player_id] = player
+        self._specialize_for_seat_count()
+        self._sync_seat(position)
+        self._update_blind_seats()
 
         return player_id
-    
+
+    def _specialize_for_seat_count(self):
+        """Precompute the seat-count dependent constants read on every action."""
+        n = len(self.players)
+        all_seats = (1 << n) - 1
+        self._seat_bits = _SEAT_BITS[:n]
+        self._seat_bets = self._bet[:n]
+        # Mask of the seats strictly after each seat, before wrapping around
+        self._later_seats = tuple(all_seats & ~((2 << i) - 1) for i in range(n))
+
+    def _update_blind_seats(self):
+        """Recompute the blind and under-the-gun seats from the dealer button."""
+        n = len(self.players)
+        if n > 1:
+            self._sb_idx = (self.dealer_position + 1) % n
+            self._bb_idx = (self.dealer_position + 2) % n
+            self._utg_idx = (self.dealer_position + 3) % n
+        else:
+            self._sb_idx = -1
+            self._bb_idx = -1
+            self._utg_idx = -1
+
+    @property
+    def community_cards(self) -> np.ndarray:
+        """Community cards dealt so far, as card indices."""
+        return self._community[:self._n_community]
+
+    def _sync_seat(self, index: int):
+        """Mirror a player's betting fields into the per-seat array and masks."""
+        player = self.players[index]
+        bit = 1 << index
+        self._bet[index] = player.bet
+        self._in_hand_mask = _with_bit(self._in_hand_mask, bit, not (player.has_folded or player.is_all_in))
+        self._unfolded_mask = _with_bit(self._unfolded_mask, bit, not player.has_folded)
+        self._active_mask = _with_bit(self._active_mask, bit, player.is_active)
+
+    def _sync_all_seats(self):
+        """Mirror every player's betting fields into the per-seat array and masks."""
+        for index in range(len(self.players)):
+            self._sync_seat(index)
+
+    def _next_live_seat(self, index: int) -> int:
+        """First seat strictly after index that is still in the hand, wrapping around."""
+        mask = self._in_hand_mask
+        after = mask & self._later_seats[index]
+        if not after:
+            after = mask
+        return (after & -after).bit_length() - 1
+
     def start_new_hand(self):
         """Start a new hand."""
         if len(self.players) < 2:
             raise ValueError("Need at least 2 players to start")
-        
+        self._state_version += 1
+
         # Reset all players for new hand
         for player in self.players:
             player.reset_for_new_hand()
+        self._sync_all_seats()
         
-        # Initialize deck and shuffle
-        self.deck = Deck()
-        self.community_cards = []
+        # Initialize deck and shuffle; later hands reshuffle the same buffer
+        # (hole cards dealt from it were released by reset_for_new_hand above)
+        if self.deck is None:
+            self.deck = Deck()
+        else:
+            self.deck.reset()
+        self._n_community = 0
+        self._community_str.clear()
         self.pot = 0
         self.current_bet = 0
         self.phase = GamePhase.PREFLOP
-        self.hand_id = str(uuid.uuid4())
-        self.action_history = []
+        # Table ids are already unique, so a per-table counter suffices
+        self._hand_counter += 1
+        self.hand_id = f"{self.table_id}:{self._hand_counter}"
+        self._action_n = 0
         
         # Move dealer button
         self.dealer_position = (self.dealer_position + 1) % len(self.players)
-        
+        self._update_blind_seats()
+
         # Post blinds
         self._post_blinds()
         
@@ -161,35 +368,34 @@ class PokerGame:
         self._deal_hole_cards()
 
         # Set first player to act (after big blind)
-        self.current_player_index = (self.dealer_position + 3) % len(self.players)
+        self.current_player_index = self._utg_idx
         # For preflop, betting round completes when action returns to big blind
-        # Big blind is at dealer + 2
-        bb_index = (self.dealer_position + 2) % len(self.players)
-        self.betting_round_start_index = bb_index
+        self.betting_round_start_index = self._bb_idx
         # BB posted blind, so they are the initial "raiser" for preflop
-        self.last_raiser_index = bb_index
+        self.last_raiser_index = self._bb_idx
     
     def _post_blinds(self):
         """Post small and big blinds."""
-        active_players = [p for p in self.players if p.is_active]
-        if len(active_players) < 2:
+        if self._active_mask.bit_count() < 2:
             return
         
         # Small blind (dealer + 1)
-        sb_index = (self.dealer_position + 1) % len(self.players)
+        sb_index = self._sb_idx
         sb_player = self.players[sb_index]
         sb_amount = min(self.small_blind, sb_player.stack)
         sb_player.stack -= sb_amount
         sb_player.bet = sb_amount
         self.pot += sb_amount
+        self._sync_seat(sb_index)
         
         # Big blind (dealer + 2)
-        bb_index = (self.dealer_position + 2) % len(self.players)
+        bb_index = self._bb_idx
         bb_player = self.players[bb_index]
         bb_amount = min(self.big_blind, bb_player.stack)
         bb_player.stack -= bb_amount
         bb_player.bet = bb_amount
         self.pot += bb_amount
+        self._sync_seat(bb_index)
         
         self.current_bet = self.big_blind
     
@@ -199,10 +405,45 @@ class PokerGame:
             if player.is_active:
                 player.hole_cards = self.deck.deal(2)
     
+    @property
+    def action_history(self) -> np.ndarray:
+        """Actions taken so far this hand, as rows of ACTION_DTYPE."""
+        return self._action_buf[:self._action_n]
+
+    def action_history_dicts(self) -> List[Dict]:
+        """Actions taken so far this hand as dicts with ISO-8601 (UTC) timestamps."""
+        return [
+            {
+                "player_id": self.players[player_idx].player_id,
+                "action": _ACTION_TYPES[action].value,
+                "amount": amount,
+                "timestamp": _utc_isoformat(ts_ns),
+            }
+            for player_idx, action, _, amount, ts_ns in self.action_history.tolist()
+        ]
+
+    def _record_action(self, player_idx: int, action_type: str, amount: int):
+        """Append an action to the preallocated action log."""
+        if self._action_n == len(self._action_buf):
+            grown = np.empty(2 * len(self._action_buf), dtype=ACTION_DTYPE)
+            grown[:self._action_n] = self._action_buf
+            self._action_buf = grown
+        self._action_buf[self._action_n] = (
+            player_idx, ACTION_CODES[action_type], PHASE_CODES[self.phase], amount or 0, time.time_ns()
+        )
+        self._action_n += 1
+
+    def _deal_community(self, n: int):
+        """Deal n community cards into the board buffer."""
+        end = self._n_community + n
+        self._community[self._n_community:end] = self.deck.deal(n)
+        self._community_str.extend(CARD_STRS[card] for card in self._community[self._n_community:end])
+        self._n_community = end
+    
     def process_action(self, player_id: str, action_type: str, amount: int = 0) -> Dict:
         """Process a player action."""
         # Find player
-        player = next((p for p in self.players if p.player_id == player_id), None)
+        player = self.players_by_id.get(player_id)
         if not player:
             raise ValueError("Player not found")
         
@@ -223,174 +464,193 @@ class PokerGame:
             raise ValueError("Not your turn")
         
         # Process action
-        if action_type == ActionType.FOLD:
-            # Rule: Cannot fold if you can check (no additional chips needed to call)
-            # If player.bet >= current_bet, they can check, so they cannot fold
-            if player.bet >= self.current_bet:
-                raise ValueError("Cannot fold when you can check. You must check, bet, or raise.")
-            player.has_folded = True
-            player.is_active = False
-        
-        elif action_type == ActionType.CHECK:
-            if player.bet < self.current_bet:
-                raise ValueError("Cannot check, must call or raise")
-            # Post-flop rule: Check is only allowed when no one has bet (current_bet == 0)
-            # In preflop, checking is allowed when player has matched the bet
-            if self.phase != GamePhase.PREFLOP and self.current_bet > 0:
-                raise ValueError("Cannot check when someone has bet. You must fold, call, or raise.")
-        
-        elif action_type == ActionType.CALL:
-            # Post-flop rule: Call is only allowed when someone has bet (current_bet > 0)
-            if self.phase != GamePhase.PREFLOP and self.current_bet == 0:
-                raise ValueError("Cannot call when no one has bet. You must check or bet.")
-            needed = self.current_bet - player.bet
-            if needed <= 0:
-                raise ValueError("Nothing to call. You must check or bet/raise.")
-            call_amount = min(needed, player.stack)
-            player.stack -= call_amount
-            player.bet += call_amount
-            self.pot += call_amount
-            if player.stack == 0:
-                player.is_all_in = True
-        
-        elif action_type == ActionType.RAISE or action_type == ActionType.BET:
-            # Post-flop rule: Bet is only allowed when no one has bet (current_bet == 0)
-            # Raise is only allowed when someone has bet (current_bet > 0)
-            if self.phase != GamePhase.PREFLOP:
-                if action_type == ActionType.BET and self.current_bet > 0:
-                    raise ValueError("Cannot bet when someone has already bet. You must fold, call, or raise.")
-                if action_type == ActionType.RAISE and self.current_bet == 0:
-                    raise ValueError("Cannot raise when no one has bet. You must check or bet.")
-            
-            if amount is None:
-                amount = 0
-
-            if amount <= 0:
-                raise ValueError("Amount must be positive")
-
-            # The API semantics for BET/RAISE are "target total bet" for this player
-            # e.g. if player.bet is 10 and they raise to 30, amount == 30 and they pay 20 more.
-            max_total = player.bet + player.stack
-            target_total = min(int(amount), max_total)
-            amount = target_total
-
-            if target_total <= player.bet:
-                raise ValueError("Bet/raise must increase your total bet")
-
-            # Validate action type vs current bet (post-flop rules already checked above)
-            if self.current_bet > 0:
-                if target_total <= self.current_bet:
-                    raise ValueError("Raise must be greater than current bet")
+        handler = self._ACTION_HANDLERS.get(action_type)
+        if handler is None:
+            raise ValueError(f"Invalid action type: {action_type}")
+        amount = _coerce_amount(amount)
+        try:
+            amount = handler(self, player, amount)
+
+            self._sync_seat(self.current_player_index)
+
+            # Track preflop actions for BB option rule
+            if self.phase == GamePhase.PREFLOP:
+                if self.current_player_index == self._bb_idx:
+                    # BB has acted (not just posted blind, but took an action)
+                    # Any action (check, call, raise, fold, all-in) after posting blind counts
+                    # The blind posting itself doesn't count as an action for betting round completion
+                    self.bb_has_acted_preflop = True
+
+            # Record action
+            self._record_action(self.current_player_index, action_type, amount)
+
+            # Move to next player or next phase
+            self._advance_action()
+        finally:
+            # Invalidate the memoized state even if a step above raised part-way
+            self._state_version += 1
 
+        return {"status": "success", "state": self.get_state()}
+    
+    def _do_fold(self, player: Player, amount: int) -> int:
+        """Handle a fold. Returns 0, as no chips are committed."""
+        # Rule: Cannot fold if you can check (no additional chips needed to call)
+        # If player.bet >= current_bet, they can check, so they cannot fold
+        if player.bet >= self.current_bet:
+            raise ValueError("Cannot fold when you can check. You must check, bet, or raise.")
+        player.has_folded = True
+        player.is_active = False
+        return 0
+
+    def _do_check(self, player: Player, amount: int) -> int:
+        """Handle a check. Returns 0, as no chips are committed."""
+        if player.bet < self.current_bet:
+            raise ValueError("Cannot check, must call or raise")
+        # Post-flop rule: Check is only allowed when no one has bet (current_bet == 0)
+        # In preflop, checking is allowed when player has matched the bet
+        if self.phase != GamePhase.PREFLOP and self.current_bet > 0:
+            raise ValueError("Cannot check when someone has bet. You must fold, call, or raise.")
+        return 0
+
+    def _do_call(self, player: Player, amount: int) -> int:
+        """Handle a call. Returns the chips actually committed."""
+        # Post-flop rule: Call is only allowed when someone has bet (current_bet > 0)
+        if self.phase != GamePhase.PREFLOP and self.current_bet == 0:
+            raise ValueError("Cannot call when no one has bet. You must check or bet.")
+        needed = self.current_bet - player.bet
+        if needed <= 0:
+            raise ValueError("Nothing to call. You must check or bet/raise.")
+        call_amount = min(needed, player.stack)
+        player.stack -= call_amount
+        player.bet += call_amount
+        self.pot += call_amount
+        if player.stack == 0:
+            player.is_all_in = True
+        return call_amount
+
+    def _do_bet(self, player: Player, amount: int) -> int:
+        """Handle a bet to a target total. Returns the amount to record."""
+        return self._do_bet_or_raise(player, ActionType.BET, amount)
+
+    def _do_raise(self, player: Player, amount: int) -> int:
+        """Handle a raise to a target total. Returns the amount to record."""
+        return self._do_bet_or_raise(player, ActionType.RAISE, amount)
+
+    def _do_bet_or_raise(self, player: Player, action_type: ActionType, amount: int) -> int:
+        """Shared bet/raise logic. Returns the normalized target total."""
+        # Post-flop rule: Bet is only allowed when no one has bet (current_bet == 0)
+        # Raise is only allowed when someone has bet (current_bet > 0)
+        if self.phase != GamePhase.PREFLOP:
+            if action_type == ActionType.BET and self.current_bet > 0:
+                raise ValueError("Cannot bet when someone has already bet. You must fold, call, or raise.")
+            if action_type == ActionType.RAISE and self.current_bet == 0:
+                raise ValueError("Cannot raise when no one has bet. You must check or bet.")
+
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+
+        # The API semantics for BET/RAISE are "target total bet" for this player
+        # e.g. if player.bet is 10 and they raise to 30, amount == 30 and they pay 20 more.
+        max_total = player.bet + player.stack
+        target_total = min(amount, max_total)
+        amount = target_total
+
+        if target_total <= player.bet:
+            raise ValueError("Bet/raise must increase your total bet")
+
+        # Validate action type vs current bet (post-flop rules already checked above)
+        if self.current_bet > 0:
+            if target_total <= self.current_bet:
+                raise ValueError("Raise must be greater than current bet")
+
+            min_raise_total = max(
+                self.current_bet + (self.last_raise_size if self.last_raise_size > 0 else self.big_blind),
+                self.current_bet * 2
+            )
+
+            # Allow an all-in raise below min raise only if the player cannot cover the minimum.
+            if target_total < min_raise_total and target_total < max_total:
+                raise ValueError(f"Raise must be at least {min_raise_total}")
+        else:
+            # Bet: must be at least the big blind, unless the player is all-in for less.
+            min_bet_total = self.big_blind
+            if target_total < min_bet_total and target_total < max_total:
+                raise ValueError(f"Bet must be at least {min_bet_total}")
+
+        additional = target_total - player.bet
+        player.stack -= additional
+        player.bet = target_total
+        self.pot += additional
+
+        # This is an aggressive action; everyone else needs to act after this.
+        previous_current_bet = self.current_bet
+        if target_total > self.current_bet:
+            # Update last raise size only for a full raise that meets the min raise requirement.
+            if previous_current_bet > 0:
                 min_raise_total = max(
-                    self.current_bet + (self.last_raise_size if self.last_raise_size > 0 else self.big_blind),
-                    self.current_bet * 2
+                    previous_current_bet + (self.last_raise_size if self.last_raise_size > 0 else self.big_blind),
+                    previous_current_bet * 2
                 )
-
-                # Allow an all-in raise below min raise only if the player cannot cover the minimum.
-                if target_total < min_raise_total and target_total < max_total:
-                    raise ValueError(f"Raise must be at least {min_raise_total}")
+                if target_total >= min_raise_total:
+                    self.last_raise_size = target_total - previous_current_bet
             else:
-                # Bet: must be at least the big blind, unless the player is all-in for less.
-                min_bet_total = self.big_blind
-                if target_total < min_bet_total and target_total < max_total:
-                    raise ValueError(f"Bet must be at least {min_bet_total}")
-
-            additional = target_total - player.bet
-            player.stack -= additional
-            player.bet = target_total
-            self.pot += additional
-
-            # This is an aggressive action; everyone else needs to act after this.
-            previous_current_bet = self.current_bet
-            if target_total > self.current_bet:
-                # Update last raise size only for a full raise that meets the min raise requirement.
-                if previous_current_bet > 0:
-                    min_raise_total = max(
-                        previous_current_bet + (self.last_raise_size if self.last_raise_size > 0 else self.big_blind),
-                        previous_current_bet * 2
-                    )
-                    if target_total >= min_raise_total:
-                        self.last_raise_size = target_total - previous_current_bet
-                else:
-                    # First bet in a round sets the raise size to the bet amount (unless it's a short all-in).
-                    if target_total >= self.big_blind:
-                        self.last_raise_size = target_total
-
-                self.current_bet = target_total
-                self.last_raiser_index = self.current_player_index
-
-            if player.stack == 0:
-                player.is_all_in = True
-        
-        elif action_type == ActionType.ALL_IN:
-            all_in_amount = player.stack
-            player.stack = 0
-            player.bet += all_in_amount
-            self.pot += all_in_amount
+                # First bet in a round sets the raise size to the bet amount (unless it's a short all-in).
+                if target_total >= self.big_blind:
+                    self.last_raise_size = target_total
+
+            self.current_bet = target_total
+            self.last_raiser_index = self.current_player_index
+
+        if player.stack == 0:
             player.is_all_in = True
-            if player.bet > self.current_bet:
-                # Update current bet and last raise size if this is a raise
-                if self.current_bet > 0:
-                    # This is an all-in raise, track the raise size
-                    self.last_raise_size = player.bet - self.current_bet
-                else:
-                    # This is an all-in bet, the raise size is the bet amount
-                    self.last_raise_size = player.bet
-                self.current_bet = player.bet
-                # Track who raised/bet last - everyone else needs to act after this
-                self.last_raiser_index = self.current_player_index
-        
-        # Track preflop actions for BB option rule
-        if self.phase == GamePhase.PREFLOP:
-            bb_index = (self.dealer_position + 2) % len(self.players)
-            bb_player = self.players[bb_index]
-
-            if player_id == bb_player.player_id:
-                # BB has acted (not just posted blind, but took an action)
-                # Any action (check, call, raise, fold, all-in) after posting blind counts
-                # The blind posting itself doesn't count as an action for betting round completion
-                self.bb_has_acted_preflop = True
-        
-        # Record action
-        self.action_history.append({
-            "player_id": player_id,
-            "action": action_type,
-            "amount": amount,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-        # Move to next player or next phase
-        self._advance_action()
-        
-        return {"status": "success", "state": self.get_state()}
+
+        return amount
+
+    def _do_all_in(self, player: Player, amount: int) -> int:
+        """Handle an all-in. Returns the chips actually committed."""
+        all_in_amount = player.stack
+        player.stack = 0
+        player.bet += all_in_amount
+        self.pot += all_in_amount
+        player.is_all_in = True
+        if player.bet > self.current_bet:
+            # Update current bet and last raise size if this is a raise
+            if self.current_bet > 0:
+                # This is an all-in raise, track the raise size
+                self.last_raise_size = player.bet - self.current_bet
+            else:
+                # This is an all-in bet, the raise size is the bet amount
+                self.last_raise_size = player.bet
+            self.current_bet = player.bet
+            # Track who raised/bet last - everyone else needs to act after this
+            self.last_raiser_index = self.current_player_index
+        return all_in_amount
+
+    # Action type -> handler, dispatched with a single dict lookup
+    _ACTION_HANDLERS = {
+        ActionType.FOLD: _do_fold,
+        ActionType.CHECK: _do_check,
+        ActionType.CALL: _do_call,
+        ActionType.BET: _do_bet,
+        ActionType.RAISE: _do_raise,
+        ActionType.ALL_IN: _do_all_in,
+    }
     
     def _advance_action(self):
         """Move to next player or next phase."""
-        active_players = [p for p in self.players if not p.has_folded and not p.is_all_in]
-
-        if len(active_players) <= 1:
-            # Only one player left or everyone all-in, go to showdown
-            self._complete_hand()
+        if self._unfolded_mask.bit_count() == 1:
+            # Everyone else folded: award the pot without a showdown
+            self._award_uncontested()
             return
 
-        # Move to next active player
-        self.current_player_index = (self.current_player_index + 1) % len(self.players)
-
-        # Skip folded/all-in players, but don't loop forever
-        attempts = 0
-        while (self.players[self.current_player_index].has_folded or \
-              self.players[self.current_player_index].is_all_in) and \
-              attempts < len(self.players):
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
-            attempts += 1
-
-        # Check if we've gone through all players (shouldn't happen normally)
-        if attempts >= len(self.players):
-            # All players are folded or all-in, complete hand
+        if self._in_hand_mask.bit_count() <= 1:
+            # Everyone remaining is all-in (or only one can still act), go to showdown
             self._complete_hand()
             return
 
+        # Move to next active player, skipping folded/all-in players
+        self.current_player_index = self._next_live_seat(self.current_player_index)
+
         # Check if betting round is complete AFTER moving to next player
         # This ensures everyone has had a chance to act before completing
         if self._is_betting_round_complete():
@@ -405,17 +665,12 @@ class PokerGame:
         2. Action has returned to the player after the last raiser (or betting round start if no raises)
         3. For preflop, BB must have acted (not just posted blind)
         """
-        active_players = [p for p in self.players if not p.has_folded and not p.is_all_in]
-        if not active_players:
-            return True
-
-        if len(active_players) <= 1:
+        if self._in_hand_mask.bit_count() <= 1:
             return True
 
         # All active players have matched the current bet
-        all_matched = all(p.bet == self.current_bet for p in active_players)
-
-        if not all_matched:
+        live = (self._in_hand_mask & self._seat_bits) != 0
+        if not ((self._seat_bets == self.current_bet) | ~live).all():
             return False
 
         # Determine the completion point:
@@ -425,7 +680,7 @@ class PokerGame:
 
         # Special case for preflop: BB must have acted (not just posted blind)
         if self.phase == GamePhase.PREFLOP:
-            bb_index = (self.dealer_position + 2) % len(self.players)
+            bb_index = self._bb_idx
             # If BB is the completion point and they haven't acted yet, round is not complete.
             if completion_index == bb_index and not self.bb_has_acted_preflop:
                 return False
@@ -447,66 +702,115 @@ class PokerGame:
         # Reset bets for next round
         for player in self.players:
             player.bet = 0
+        self._bet[:] = 0
         self.current_bet = 0
         self.last_raise_size = 0  # Reset raise size for new betting round
         self.last_raiser_index = None  # Reset last raiser for new betting round
         
         if self.phase == GamePhase.PREFLOP:
             self.phase = GamePhase.FLOP
-            self.community_cards.extend(self.deck.deal(3))
+            self._deal_community(3)
         elif self.phase == GamePhase.FLOP:
             self.phase = GamePhase.TURN
-            self.community_cards.extend(self.deck.deal(1))
+            self._deal_community(1)
         elif self.phase == GamePhase.TURN:
             self.phase = GamePhase.RIVER
-            self.community_cards.extend(self.deck.deal(1))
+            self._deal_community(1)
         elif self.phase == GamePhase.RIVER:
             self._complete_hand()
             return
         
         # Set first player to act (after dealer)
-        self.current_player_index = (self.dealer_position + 1) % len(self.players)
-        while self.players[self.current_player_index].has_folded or \
-              self.players[self.current_player_index].is_all_in:
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        self.current_player_index = self._next_live_seat(self.dealer_position)
         
         # Track where this betting round started
         self.betting_round_start_index = self.current_player_index
     
     def _complete_hand(self):
         """Complete the hand and determine winner."""
+        if self._unfolded_mask.bit_count() == 1:
+            self._award_uncontested()
+        else:
+            self._showdown_eval()
+    
+    def _award_uncontested(self):
+        """Award the pot to the only player who has not folded, skipping showdown."""
+        winner = self.players[(self._unfolded_mask & -self._unfolded_mask).bit_length() - 1]
+        winner.stack += self.pot
+        self.pot = 0
+        self.phase = GamePhase.FINISHED
+    
+    def _showdown_eval(self):
+        """Go to showdown between the remaining players and award the pot."""
         self.phase = GamePhase.SHOWDOWN
         
         # Simple winner determination (first active player wins for now)
         # In a full implementation, this would evaluate hand strength
-        active_players = [p for p in self.players if not p.has_folded]
-        if active_players:
-            winner = active_players[0]
+        if self._unfolded_mask:
+            winner = self.players[(self._unfolded_mask & -self._unfolded_mask).bit_length() - 1]
             winner.stack += self.pot
             self.pot = 0
         
         self.phase = GamePhase.FINISHED
     
     def get_state(self, requesting_player_id: str = None) -> Dict:
-        """Get current game state."""
+        """Get current game state.
+
+        The public state (no hole cards) is built once per state change;
+        a player's view copies it and fills in only their own hole cards.
+        Results are memoized per requester and reused until the next
+        state-changing call (add_player, start_new_hand, process_action),
+        so callers must treat them as read-only.
+        """
+        if self._state_cache_version != self._state_version:
+            self._state_cache = {}
+            self._state_cache_version = self._state_version
+        cached = self._state_cache.get(requesting_player_id)
+        if cached is not None:
+            return cached
+
+        public = self._state_cache.get(None)
+        if public is None:
+            public = self._build_public_state()
+            self._state_cache[None] = public
+        if requesting_player_id is None:
+            return public
+
+        state = public
+        player = self.players_by_id.get(requesting_player_id)
+        if player is not None:
+            players = list(public["players"])
+            players[player.position] = {
+                **players[player.position],
+                "hole_cards": [CARD_STRS[card] for card in player.hole_cards],
+            }
+            state = {**public, "players": players}
+        self._state_cache[requesting_player_id] = state
+        return state
+
+    def _build_public_state(self) -> Dict:
+        """Build the game state as seen by a spectator."""
         current_player_id = None
         if self.phase in [GamePhase.PREFLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER]:
             if 0 <= self.current_player_index < len(self.players):
                 current_player_id = self.players[self.current_player_index].player_id
-        
+
+        dealer = self.dealer_position
+        sb = self._sb_idx
+        bb = self._bb_idx
         return {
             "table_id": self.table_id,
             "phase": self.phase.value,
             "players": [
                 {
-                    **p.to_dict(show_cards=(requesting_player_id == p.player_id)),
-                    "is_dealer": i == self.dealer_position,
-                    "is_small_blind": i == (self.dealer_position + 1) % len(self.players) if len(self.players) > 1 else False,
-                    "is_big_blind": i == (self.dealer_position + 2) % len(self.players) if len(self.players) > 1 else False,
+                    **p.to_dict(),
+                    "is_dealer": i == dealer,
+                    "is_small_blind": i == sb,
+                    "is_big_blind": i == bb,
                 }
                 for i, p in enumerate(self.players)
             ],
-            "community_cards": [str(card) for card in self.community_cards],
+            "community_cards": list(self._community_str),
             "pot": self.pot,
             "current_bet": self.current_bet,
             "last_raise_size": self.last_raise_size,
@@ -3,17 +3,62 @@ Main FastAPI application for 9-max No Limit Hold'em poker game.
 """
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List, Set
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Dict, Set
 import json
+import os
+import threading
 import uuid
+import zlib
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+import numpy as np
+
 from game.poker_game import PokerGame
-from models.game_state import GameStateResponse, PlayerAction, CreateTableRequest
-from ai.cfr_engine import PokerAI
+from models.game_state import GameStateResponse, PlayerAction, CreateTableRequest, EquityRequest
+from ai.cfr_engine import PokerAI, HandEvaluator, simulate_equity
+
+try:
+    import orjson
+except ImportError:  # orjson has no PyPy build; fall back to the stdlib encoder
+    orjson = None
+
+
+def _numpy_default(obj):
+    """Serialize NumPy arrays and scalars for the stdlib JSON encoder."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def _dumps(message) -> bytes:
+        """Serialize a message to compact JSON bytes."""
+        return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    _loads = orjson.loads
+    _DefaultResponse = ORJSONResponse
+else:
+    def _dumps(message) -> bytes:
+        """Serialize a message to compact JSON bytes."""
+        return json.dumps(message, separators=(",", ":"), default=_numpy_default).encode()
+
+    _loads = json.loads
+    _DefaultResponse = JSONResponse
 
-app = FastAPI(title="Poker Trainer API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the game engine on startup when WARMUP_HANDS is set."""
+    num_hands = int(os.environ.get("WARMUP_HANDS", "0"))
+    if num_hands > 0:
+        warm_up(num_hands)
+    yield
+
+
+app = FastAPI(title="Poker Trainer API", version="1.0.0", lifespan=lifespan,
+              default_response_class=_DefaultResponse)
 
 # CORS middleware for Next.js frontend
 app.add_middleware(
@@ -24,41 +69,88 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store active games, WebSocket connections, and AI players
+# Store active games and AI players (connections live in ConnectionManager)
 active_games: Dict[str, PokerGame] = {}
-active_connections: Dict[str, Set[WebSocket]] = {}
 ai_players: Dict[str, PokerAI] = {}  # Maps player_id to PokerAI instance
+# simulate_equity is a parallel numba kernel; numba's workqueue threading
+# layer aborts the process if two threads launch one concurrently
+_equity_lock = threading.Lock()
 
 
 class ConnectionManager:
     """Manage WebSocket connections for real-time game updates."""
     
     def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Connections that asked for zlib-compressed binary broadcasts
+        self.deflate_connections: Set[WebSocket] = set()
     
-    async def connect(self, websocket: WebSocket, table_id: str):
+    async def connect(self, websocket: WebSocket, table_id: str, deflate: bool = False):
         await websocket.accept()
-        if table_id not in self.active_connections:
-            self.active_connections[table_id] = []
-        self.active_connections[table_id].append(websocket)
+        self.active_connections.setdefault(table_id, set()).add(websocket)
+        if deflate:
+            self.deflate_connections.add(websocket)
     
     def disconnect(self, websocket: WebSocket, table_id: str):
         if table_id in self.active_connections:
-            self.active_connections[table_id].remove(websocket)
+            self.active_connections[table_id].discard(websocket)
+        self.deflate_connections.discard(websocket)
     
     async def broadcast(self, message: dict, table_id: str):
-        """Broadcast message to all connected clients at a table."""
-        if table_id in self.active_connections:
-            for connection in self.active_connections[table_id]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    pass
+        """Broadcast message to all connected clients at a table.
+
+        The message is serialized once (and compressed at most once, for
+        connections that opted into deflate) and sent to every connection
+        concurrently; connections whose send fails are dropped.
+        """
+        connections = tuple(self.active_connections.get(table_id, ()))
+        if not connections:
+            return
+        payload = _dumps(message)
+        text = payload.decode()
+        compressed = None
+        if not self.deflate_connections.isdisjoint(connections):
+            compressed = zlib.compress(payload, 1)
+        results = await asyncio.gather(
+            *(connection.send_bytes(compressed) if connection in self.deflate_connections
+              else connection.send_text(text)
+              for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, table_id)
 
 
 manager = ConnectionManager()
 
 
+def warm_up(num_hands: int):
+    """Play throwaway check/call hands so a JIT (e.g. PyPy) traces the game loop."""
+    def new_game() -> PokerGame:
+        game = PokerGame("warmup", 9, 5, 10, 1000)
+        for i in range(6):
+            game.add_player(f"warmup-{i}")
+        return game
+
+    game = None
+    for hand in range(num_hands):
+        if hand % 100 == 0:
+            # Start over before stacks run dry
+            game = new_game()
+        try:
+            game.start_new_hand()
+            for _ in range(200):
+                if game.phase.value not in ["preflop", "flop", "turn", "river"]:
+                    break
+                player = game.players[game.current_player_index]
+                action = "call" if player.bet < game.current_bet else "check"
+                game.process_action(player.player_id, action)
+                game.get_state()
+        except ValueError:
+            game = new_game()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -102,6 +194,16 @@ async def get_table_state(table_id: str, player_id: str = None):
     return game.get_state(requesting_player_id=player_id)
 
 
+@app.get("/api/tables/{table_id}/history")
+async def get_hand_history(table_id: str):
+    """Get the actions taken so far in the current hand."""
+    if table_id not in active_games:
+        raise HTTPException(status_code=404, detail="Table not found")
+
+    game = active_games[table_id]
+    return {"hand_id": game.hand_id, "actions": game.action_history_dicts()}
+
+
 @app.post("/api/tables/{table_id}/join")
 async def join_table(table_id: str, player_name: str):
     """Join a poker table as a new player."""
@@ -307,9 +409,13 @@ async def start_game(table_id: str):
 
 
 @app.websocket("/ws/{table_id}")
-async def websocket_endpoint(websocket: WebSocket, table_id: str):
-    """WebSocket endpoint for real-time game updates."""
-    await manager.connect(websocket, table_id)
+async def websocket_endpoint(websocket: WebSocket, table_id: str, encoding: str = None):
+    """WebSocket endpoint for real-time game updates.
+
+    Pass encoding=deflate to receive broadcasts as zlib-compressed binary
+    frames; direct replies (initial state, pong, errors) stay JSON text.
+    """
+    await manager.connect(websocket, table_id, deflate=(encoding == "deflate"))
     
     try:
         # Send initial state
@@ -324,7 +430,7 @@ async def websocket_endpoint(websocket: WebSocket, table_id: str):
         # Keep connection alive and handle incoming messages
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = _loads(data)
             
             # Handle different message types
             if message.get("type") == "ping":
@@ -368,6 +474,32 @@ async def websocket_endpoint(websocket: WebSocket, table_id: str):
         manager.disconnect(websocket, table_id)
 
 
+@app.post("/api/equity")
+def estimate_equity(request: EquityRequest):
+    """Estimate a hand's equity against random opponent holdings.
+
+    Declared sync so FastAPI runs the simulation in its threadpool
+    instead of blocking the event loop. Simulations run one at a time;
+    each already spreads its trials across all cores.
+    """
+    try:
+        hole = HandEvaluator.encode_cards(request.hole_cards)
+        board = HandEvaluator.encode_cards(request.community_cards)
+        dead = HandEvaluator.encode_cards(request.dead_cards)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid card: {e.args[0]}")
+
+    known = np.concatenate([hole, board, dead])
+    if len(np.unique(known)) != len(known):
+        raise HTTPException(status_code=400, detail="Duplicate cards")
+    if 52 - len(known) < 5 - len(board) + 2 * request.num_opponents:
+        raise HTTPException(status_code=400, detail="Not enough cards in deck")
+
+    with _equity_lock:
+        equity = simulate_equity(hole, board, dead, request.num_trials, request.num_opponents)
+    return {"equity": float(equity), "num_trials": request.num_trials}
+
+
 @app.delete("/api/tables/{table_id}")
 async def delete_table(table_id: str):
     """Delete a poker table."""
@@ -378,7 +510,7 @@ async def delete_table(table_id: str):
     
     # Disconnect all WebSocket connections
     if table_id in manager.active_connections:
-        for connection in manager.active_connections[table_id]:
+        for connection in tuple(manager.active_connections[table_id]):
             await connection.close()
         del manager.active_connections[table_id]
     
@@ -34,6 +34,15 @@ class CreateTableRequest(BaseModel):
     starting_stack: int = Field(default=1000, ge=100)
 
 
+class EquityRequest(BaseModel):
+    """Request to estimate a hand's equity by Monte Carlo simulation."""
+    hole_cards: List[str] = Field(min_length=2, max_length=2)
+    community_cards: List[str] = Field(default_factory=list, max_length=5)
+    dead_cards: List[str] = Field(default_factory=list)
+    num_opponents: int = Field(default=1, ge=1, le=8)
+    num_trials: int = Field(default=1000, ge=1, le=100000)
+
+
 class PlayerAction(BaseModel):
     """Player action in the game."""
     player_id: str
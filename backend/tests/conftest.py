@@ -0,0 +1,90 @@
+"""
+Shared fixtures for the backend tests.
+"""
+import copy
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+
+from game.poker_game import Deck, PokerGame, seed_rng
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "heavy: slow tests (process pools, long self-play); skip with -m 'not heavy'",
+    )
+
+
+def _reset_to_flop(game: PokerGame) -> PokerGame:
+    """Test-only shortcut: close preflop and deal the flop without playing any actions.
+
+    Uses the engine's own phase transition so the bet arrays, seat pointer
+    and board stay consistent; blinds already posted remain in the pot.
+    """
+    game._advance_phase()
+    game._state_version += 1
+    return game
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _seed():
+    """Seed the engine's shuffling generator so dealt cards are reproducible."""
+    seed_rng(0xC0FFEE)
+    yield
+
+
+@pytest.fixture(scope="session")
+def _deck_template():
+    """A shuffled deck built once per session."""
+    return Deck()
+
+
+@pytest.fixture
+def deck(_deck_template):
+    """A full deck per test, copied from the session template."""
+    return copy.deepcopy(_deck_template)
+
+
+@pytest.fixture(scope="module")
+def one_player_game():
+    """A waiting table with only Alice seated, shared read-only by a module's tests."""
+    game = PokerGame("table1", 9, 5, 10, 1000)
+    game.add_player("Alice")
+    return game
+
+
+@pytest.fixture
+def make_game():
+    """Factory for a 9-max 5/10 table with 1000-chip stacks and the given players seated."""
+    def _make_game(players=("Alice", "Bob")) -> PokerGame:
+        game = PokerGame("table1", 9, 5, 10, 1000)
+        for name in players:
+            game.add_player(name)
+        return game
+    return _make_game
+
+
+@pytest.fixture(scope="module")
+def _heads_up_template():
+    """Alice vs Bob with the first hand dealt, built once per module."""
+    game = PokerGame("table1", 9, 5, 10, 1000)
+    game.add_player("Alice")
+    game.add_player("Bob")
+    game.start_new_hand()
+    return game
+
+
+@pytest.fixture
+def heads_up(_heads_up_template):
+    """A heads-up game at the start of preflop, deep-copied per test."""
+    return copy.deepcopy(_heads_up_template)
+
+
+@pytest.fixture
+def heads_up_flop(heads_up):
+    """The heads-up game moved straight to the flop with no preflop action."""
+    return _reset_to_flop(heads_up)
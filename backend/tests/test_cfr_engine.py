@@ -0,0 +1,212 @@
+"""
+Basic tests for the AI engine.
+Run with: pytest test_cfr_engine.py
+"""
+import numpy as np
+import pytest
+
+from ai.cfr_engine import (
+    CFRAgent, HandEvaluator, PokerAI, CARD_INDEX, CHIP_BITS, NUM_PLAYERS_BITS, batch_runouts,
+    chip_bucket, evaluate_batch, evaluate_u8, simulate_equity, _map_action_cached, _outcome_regret,
+    _selfplay_hand,
+)
+from game.poker_game import PHASE_CODES, Card
+from models.game_state import GamePhase
+
+
+def test_card_index_matches_engine_encoding():
+    """Test that Card.idx uses the evaluator's card encoding."""
+    for rank in Card.RANKS:
+        for suit in Card.SUITS:
+            assert Card(rank, suit).idx == CARD_INDEX[rank + suit]
+
+
+
+
+@pytest.mark.parametrize("phase", list(GamePhase))
+def test_info_set_phase_uses_engine_phase_codes(phase):
+    """Test that info sets key phase names with the game engine's phase codes."""
+    info_set = PokerAI._create_info_set(phase.value, 0, 0, 0, 0, 2)
+    assert info_set >> (4 * CHIP_BITS + NUM_PLAYERS_BITS) == PHASE_CODES[phase]
+
+def _agent_with_regrets(*rows) -> CFRAgent:
+    """An agent whose first len(rows) information sets hold the given regrets."""
+    agent = CFRAgent(initial_capacity=len(rows))
+    for info_set, regrets in enumerate(rows):
+        agent.regret_sum[agent._index(info_set)] = regrets
+    return agent
+
+
+def test_get_strategy_batch_regret_matching():
+    """Test that positive regrets are normalized and other rows play uniformly."""
+    agent = _agent_with_regrets([1, 3, 0], [-2, -1, 0], [-1, 2, 2])
+
+    expected = [[0.25, 0.75, 0.0], [1 / 3, 1 / 3, 1 / 3], [0.0, 0.5, 0.5]]
+    assert np.allclose(agent.get_strategy_batch(), expected)
+    assert np.allclose(agent.get_strategy_batch([2, 0]), [expected[2], expected[0]])
+    assert agent.get_strategy_batch([]).shape == (0, 3)
+
+
+def test_get_strategy_is_lazy_and_uniform_for_unseen_info_sets():
+    """Test that unvisited information sets share a read-only uniform strategy without allocating a row."""
+    agent = CFRAgent(initial_capacity=1)
+    first, second = agent.get_strategy(123), agent.get_strategy(456)
+
+    assert first is second
+    assert np.allclose(first, 1 / 3)
+    assert not first.flags.writeable
+    assert agent.num_info_sets == 0
+
+
+def test_get_action_batch_follows_pure_strategies():
+    """Test that batch sampling returns the only action a pure strategy allows."""
+    agent = _agent_with_regrets([5, 0, 0], [0, 5, 0], [0, 0, 5])
+
+    assert agent.get_action_batch().tolist() == [0, 1, 2]
+    assert agent.get_action_batch([2, 2, 1]).tolist() == [2, 2, 1]
+    assert agent.get_action_batch([]).tolist() == []
+
+
+def test_chip_bucket_packing():
+    """Test that chip buckets are exact below 32, ordered, and fit in CHIP_BITS."""
+    assert [chip_bucket(amount) for amount in (-5, 0, 1, 31)] == [0, 0, 1, 31]
+
+    # Above 32, amounts that share their top 5 bits share a bucket
+    assert chip_bucket(32) == chip_bucket(33)
+    amounts = [0, 1, 31, 32, 34, 63, 64, 100, 1000, 10 ** 6, 2 ** 62, 2 ** 63 - 1]
+    buckets = [chip_bucket(amount) for amount in amounts]
+    assert buckets == sorted(buckets)
+    assert len(set(buckets)) == len(buckets)
+    assert max(buckets) < 1 << CHIP_BITS
+    assert chip_bucket(2 ** 70) == (1 << CHIP_BITS) - 1
+
+
+@pytest.mark.parametrize("action_idx, current_bet, player_bet, player_stack, pot, expected", [
+    (0, 10, 10, 990, 20, ("check", 0)),  # fold turns into a free check
+    (0, 20, 10, 990, 30, ("fold", 0)),
+    (1, 20, 10, 990, 30, ("call", 0)),
+    (1, 10, 10, 990, 20, ("check", 0)),
+    (2, 0, 0, 1000, 40, ("bet", 30)),  # 0.5 + aggression/2 of the pot
+    (2, 0, 0, 0, 40, ("check", 0)),
+    (2, 20, 10, 990, 30, ("raise", 50)),  # (2 + aggression) times the bet
+    (2, 20, 10, 30, 30, ("call", 0)),  # too short to raise
+])
+def test_map_action_cached(action_idx, current_bet, player_bet, player_stack, pot, expected):
+    """Test the CFR action index -> (action_type, amount) mapping."""
+    assert _map_action_cached(action_idx, current_bet, player_bet, player_stack, pot, 0.5) == expected
+
+def test_hand_categories_ranked():
+    """Test that hand categories are ordered from straight flush down to high card."""
+    hands = [
+        (["As", "Ks"], ["Qs", "Js", "Ts", "2d", "3c"]),  # straight flush
+        (["9s", "9h"], ["9d", "9c", "2s", "3d", "Ac"]),  # four of a kind
+        (["9s", "9h"], ["9d", "2c", "2s", "3d", "Ac"]),  # full house
+        (["As", "3s"], ["7s", "9s", "Ts", "2d", "3c"]),  # flush
+        (["6d", "7s"], ["8s", "9h", "Ts", "2d", "3c"]),  # straight
+        (["Ad", "2s"], ["3s", "4h", "5s", "Kd", "Qc"]),  # wheel straight
+        (["9s", "9h"], ["9d", "2c", "5s", "3d", "Ac"]),  # three of a kind
+        (["9s", "9h"], ["2d", "2c", "5s", "3d", "Ac"]),  # two pair
+        (["9s", "9h"], ["2d", "7c", "5s", "3d", "Ac"]),  # one pair
+        (["9s", "Th"], ["2d", "7c", "5s", "3d", "Ac"]),  # high card
+    ]
+    scores = [HandEvaluator.evaluate_hand(hole, board) for hole, board in hands]
+    assert scores == sorted(scores, reverse=True)
+    assert len(set(scores)) == len(scores)
+
+
+def test_kicker_breaks_tie():
+    """Test that kickers decide between equal pairs."""
+    board = ["Ah", "Ad", "7c", "5s", "2d"]
+    assert HandEvaluator.evaluate_hand(["Kc", "3h"], board) > \
+        HandEvaluator.evaluate_hand(["Qc", "3h"], board)
+
+
+def test_evaluate_batch_matches_scalar():
+    """Test that the vectorized evaluator agrees with evaluate_u8."""
+    rng = np.random.default_rng(0)
+    cards = np.array([rng.permutation(52)[:7] for _ in range(2000)], dtype=np.uint8)
+    expected = [evaluate_u8(row) for row in cards]
+    assert evaluate_batch(cards).tolist() == expected
+
+
+def test_batch_runouts_skip_known_cards():
+    """Test that run-outs draw distinct cards the player cannot see."""
+    known = HandEvaluator.encode_cards(["As", "Ad", "Kc", "7h", "2d"])
+    runouts = batch_runouts(known, 6, n_trials=500)
+
+    assert runouts.shape == (500, 6)
+    assert not np.isin(runouts, known).any()
+    assert all(len(set(row)) == 6 for row in runouts.tolist())
+
+
+def test_hand_strength_monte_carlo():
+    """Test Monte Carlo hand strength on clear-cut spots."""
+    assert HandEvaluator.calculate_hand_strength(["As", "Ad"], []) > 0.75
+    assert HandEvaluator.calculate_hand_strength(["7c", "2d"], []) < 0.5
+    # Royal flush on the river cannot lose
+    assert HandEvaluator.calculate_hand_strength(["As", "Ks"], ["Qs", "Js", "Ts", "2c", "3d"]) == 1.0
+
+
+def test_simulate_equity_matches_known_spots():
+    """Test the parallel equity kernel on clear-cut spots."""
+    encode = HandEvaluator.encode_cards
+    none = encode([])
+    assert 0.8 < simulate_equity(encode(["As", "Ad"]), none, none, 5000) < 0.9
+    # A made royal flush cannot lose, whatever the opponents hold
+    royal = simulate_equity(encode(["As", "Ks"]), encode(["Qs", "Js", "Ts"]), none, 500, 3)
+    assert royal == 1.0
+
+
+def test_simulate_equity_never_deals_dead_cards():
+    """Test that dead cards are excluded from the opponents' holdings."""
+    encode = HandEvaluator.encode_cards
+    hole = encode(["As", "Ad"])
+    board = encode(["2c", "7d", "9h", "Js", "Kc"])
+    assert simulate_equity(hole, board, encode([]), 2000) > 0.8
+
+    # Leave only Kd Kh in the deck: the opponent always holds a set of kings
+    live = {"Kd", "Kh"} | {"As", "Ad", "2c", "7d", "9h", "Js", "Kc"}
+    dead = encode([card for card in CARD_INDEX if card not in live])
+    assert simulate_equity(hole, board, dead, 200) == 0.0
+
+
+def test_outcome_regret_update():
+    """Test the outcome-sampling regret: v(a') - u, with v(a) = u / s[a]."""
+    strategy = np.array([0.2, 0.5, 0.3])
+    assert _outcome_regret(strategy, 1, 10).tolist() == [-10.0, 10.0, -10.0]
+    assert _outcome_regret(strategy, 0, -4).tolist() == [-16.0, 4.0, 4.0]
+
+
+def test_outcome_regret_divides_by_own_reach():
+    """Test that later decisions are scaled by 1 / pi_i(h), the player's own reach."""
+    strategy = np.array([0.2, 0.5, 0.3])
+    assert _outcome_regret(strategy, 1, 10, reach=0.5).tolist() == [-20.0, 20.0, -20.0]
+
+
+def test_selfplay_hand_reach_weights_strategy_deltas():
+    """Test that average-strategy deltas are s / pi_-i(h), so each row sums to at least 1."""
+    agent = CFRAgent(initial_capacity=4)
+    regret_deltas, strategy_deltas = {}, {}
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        _selfplay_hand(agent, rng, 2, 1000, regret_deltas, strategy_deltas)
+
+    assert strategy_deltas
+    rows = np.array(list(strategy_deltas.values()))
+    assert np.isfinite(rows).all()
+    assert (rows.sum(axis=1) >= 1 - 1e-6).all()
+    assert (rows.sum(axis=1) > 1 + 1e-6).any()
+    assert all(np.isfinite(regret).all() for regret in regret_deltas.values())
+
+
+@pytest.mark.heavy
+def test_train_parallel_accumulates_strategy():
+    """Test that parallel self-play merges worker updates into the agent."""
+    agent = CFRAgent(initial_capacity=4)
+    agent.train_parallel(40, num_workers=2, merge_every=10)
+
+    assert agent.num_info_sets > 0
+    strategy_sum = agent.strategy_sum[:agent.num_info_sets]
+    assert np.isfinite(strategy_sum).all()
+    assert (strategy_sum >= 0).all()
+    assert strategy_sum.sum() > 0
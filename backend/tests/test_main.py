@@ -0,0 +1,115 @@
+"""
+Basic tests for the API endpoints.
+Run with: pytest test_main.py
+"""
+import asyncio
+import importlib.util
+import sys
+import zlib
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+import main
+from main import ConnectionManager, estimate_equity
+from models.game_state import EquityRequest
+
+
+def test_estimate_equity():
+    """Test equity estimation for a valid request."""
+    result = estimate_equity(EquityRequest(hole_cards=["As", "Ad"], num_trials=2000))
+    assert 0.8 < result["equity"] < 0.9
+    assert result["num_trials"] == 2000
+
+
+
+def test_estimate_equity_runs_kernel_under_lock(monkeypatch):
+    """Test that the parallel equity kernel is never launched from two threads at once."""
+    def fake_simulate_equity(*args):
+        assert main._equity_lock.locked()
+        return 0.5
+
+    monkeypatch.setattr(main, "simulate_equity", fake_simulate_equity)
+    assert estimate_equity(EquityRequest(hole_cards=["As", "Ad"]))["equity"] == 0.5
+    assert not main._equity_lock.locked()
+
+@pytest.mark.parametrize("request_kwargs, detail", [
+    ({"hole_cards": ["As", "Xx"]}, "Invalid card: Xx"),
+    ({"hole_cards": ["As", "Kd"], "community_cards": ["As", "2c", "3c"]}, "Duplicate cards"),
+    ({"hole_cards": ["As", "Kd"], "num_opponents": 8,
+      "dead_cards": ["2c", "2d", "2h", "2s", "3c", "3d", "3h", "3s", "4c", "4d", "4h", "4s",
+                     "5c", "5d", "5h", "5s", "6c", "6d", "6h", "6s", "7c", "7d", "7h", "7s",
+                     "8c", "8d", "8h", "8s", "9c", "9d", "9h", "9s"]}, "Not enough cards in deck"),
+])
+def test_estimate_equity_rejects_bad_requests(request_kwargs, detail):
+    """Test that malformed card requests are rejected with a 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        estimate_equity(EquityRequest(**request_kwargs))
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == detail
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a connected websocket."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent = []
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(data)
+
+    async def send_bytes(self, data: bytes):
+        await self.send_text(data)
+
+
+def test_broadcast_sends_once_and_drops_dead_connections():
+    """Test that broadcast reaches every live socket and reaps failed ones."""
+    manager = ConnectionManager()
+    alive, dead = FakeWebSocket(), FakeWebSocket(fail=True)
+    manager.active_connections["table1"] = {alive, dead}
+
+    asyncio.run(manager.broadcast({"type": "pong"}, "table1"))
+
+    assert alive.sent == ['{"type":"pong"}']
+    assert manager.active_connections["table1"] == {alive}
+
+
+def test_broadcast_compresses_once_for_deflate_connections():
+    """Test that opted-in sockets share one compressed frame and others get text."""
+    manager = ConnectionManager()
+    plain, deflate_a, deflate_b = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    manager.active_connections["table1"] = {plain, deflate_a, deflate_b}
+    manager.deflate_connections = {deflate_a, deflate_b}
+
+    asyncio.run(manager.broadcast({"type": "pong"}, "table1"))
+
+    assert plain.sent == ['{"type":"pong"}']
+    assert deflate_a.sent[0] is deflate_b.sent[0]
+    assert zlib.decompress(deflate_a.sent[0]) == b'{"type":"pong"}'
+
+    manager.disconnect(deflate_a, "table1")
+    assert manager.deflate_connections == {deflate_b}
+
+
+def test_stdlib_json_fallback_without_orjson(monkeypatch):
+    """Test that the app still serializes (NumPy included) when orjson is not installed."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("main_without_orjson", main.__file__)
+    fallback = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fallback)
+
+    assert fallback.orjson is None
+    assert fallback._DefaultResponse is fallback.JSONResponse
+    assert fallback._dumps({"cards": np.arange(3, dtype=np.uint8), "pot": np.int64(15)}) == \
+        b'{"cards":[0,1,2],"pot":15}'
+    assert fallback._loads('{"type":"ping"}') == {"type": "ping"}
+
+    manager = fallback.ConnectionManager()
+    socket = FakeWebSocket()
+    manager.active_connections["table1"] = {socket}
+    asyncio.run(manager.broadcast({"type": "pong"}, "table1"))
+    assert socket.sent == ['{"type":"pong"}']
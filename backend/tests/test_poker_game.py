@@ -1,30 +1,71 @@
 """
 Basic tests for the Poker Game engine.
-Run with: pytest test_poker_game.py
+Run with: pytest test_poker_game.py (or python -m tests.test_poker_game)
 """
+import re
 import sys
-from pathlib import Path
+from datetime import datetime
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-
-from game.poker_game import PokerGame, Card, Deck, Player
+from game.poker_game import PokerGame, Card, Deck, Player, seed_rng
+import numpy as np
 import pytest
 
+# Error messages the engine guarantees; compiled once for pytest.raises.
+_NOT_ENOUGH_CARDS = re.compile("Not enough cards")
+_NOT_YOUR_TURN = re.compile("Not your turn")
+_INVALID_ACTION = re.compile("Invalid action type")
+_MIN_BET = re.compile("Bet must be at least")
+_BAD_AMOUNT = re.compile("Amount (must be an integer|out of range)")
+
+
+def test_card_compares_by_index():
+    """Test that cards are equal and hash alike exactly when their index matches."""
+    assert Card("A", "s") == Card.from_idx(Card("A", "s").idx)
+    assert Card("A", "s") != Card("A", "h")
+    assert len({Card("K", "d"), Card("K", "d"), Card("2", "c")}) == 2
+    assert Card("A", "s") != "As"
 
-def test_deck_creation():
+
+def test_deck_creation(deck):
     """Test that deck has 52 cards."""
-    deck = Deck()
     assert len(deck.cards) == 52
 
 
-def test_deck_deal():
+def test_deck_deal(deck):
     """Test dealing cards from deck."""
-    deck = Deck()
     cards = deck.deal(5)
     assert len(cards) == 5
     assert len(deck.cards) == 47
 
 
+def test_deck_deal_exhausts_without_repeats(deck):
+    """Test that dealing walks the deck once and then refuses to deal more."""
+    dealt = [int(card) for _ in range(26) for card in deck.deal(2)]
+    assert sorted(dealt) == list(range(52))
+    assert len(deck.cards) == 0
+
+    with pytest.raises(ValueError, match=_NOT_ENOUGH_CARDS):
+        deck.deal(1)
+
+
+def test_deck_reset_reuses_buffer(deck):
+    """Test that reset returns every card to the same deck buffer."""
+    buffer = deck.cards
+    deck.deal(10)
+    deck.reset()
+    assert len(deck.cards) == 52
+    assert sorted(deck.cards.tolist()) == list(range(52))
+    assert np.shares_memory(deck.cards, buffer)
+
+
+def test_seed_rng_makes_shuffles_reproducible():
+    """Test that reseeding the engine generator replays the same shuffle."""
+    seed_rng(7)
+    first = Deck().cards.tolist()
+    seed_rng(7)
+    assert Deck().cards.tolist() == first
+
+
 def test_player_creation():
     """Test player initialization."""
     player = Player("player1", "Alice", 1000, 0)
@@ -63,58 +104,244 @@ def test_add_player():
     assert len(game.players) == 2
 
 
-def test_start_hand():
+def test_start_hand(heads_up):
     """Test starting a new hand."""
-    game = PokerGame("table1", 9, 5, 10, 1000)
-    game.add_player("Alice")
-    game.add_player("Bob")
-    
-    game.start_new_hand()
+    game = heads_up
     
     assert game.phase.value == "preflop"
     assert game.pot == 15  # SB + BB
     assert game.current_bet == 10
     
+    assert game.hand_id == "table1:1"
+
     # Check that players have hole cards
-    for player in game.players:
-        if player.is_active:
-            assert len(player.hole_cards) == 2
+    assert all(len(p.hole_cards) == 2 for p in game.players if p.is_active)
+
+
+@pytest.mark.parametrize("field, expected", [
+    ("table_id", "table1"),
+    ("phase", "waiting"),
+    ("pot", 0),
+    ("current_bet", 0),
+    ("small_blind", 5),
+    ("big_blind", 10),
+])
+def test_get_state(field, expected, one_player_game):
+    """Test getting game state."""
+    assert one_player_game.get_state()[field] == expected
 
 
-def test_get_state():
-    """Test getting game state."""
-    game = PokerGame("table1", 9, 5, 10, 1000)
-    game.add_player("Alice")
-    
+def test_get_state_lists_seated_players(one_player_game):
+    """Test that the state lists every seated player."""
+    assert [p["name"] for p in one_player_game.get_state()["players"]] == ["Alice"]
+
+
+def test_get_state_memoized_until_state_changes(heads_up):
+    """Test that get_state is reused until the game state changes."""
+    game = heads_up
+
     state = game.get_state()
-    
-    assert state["table_id"] == "table1"
-    assert state["phase"] == "waiting"
-    assert len(state["players"]) == 1
-    assert state["pot"] == 0
-    assert state["small_blind"] == 5
-    assert state["big_blind"] == 10
+    assert game.get_state() is state
+
+    current = game.players[game.current_player_index]
+    game.process_action(current.player_id, "call", 0)
 
+    updated = game.get_state()
+    assert updated is not state
+    assert updated["pot"] == 20
 
-def test_out_of_turn_action_rejected():
-    game = PokerGame("table1", 9, 5, 10, 1000)
-    game.add_player("Alice")
-    game.add_player("Bob")
+
+def test_get_state_invalidated_when_action_fails_part_way(heads_up, monkeypatch):
+    """Test that a process_action that raises after moving chips does not leave a stale state."""
+    game = heads_up
+    assert game.get_state()["pot"] == 15
+
+    def fail(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(PokerGame, "_advance_action", fail)
+    current = game.players[game.current_player_index]
+    with pytest.raises(RuntimeError):
+        game.process_action(current.player_id, "call", 0)
+
+    assert game.get_state()["pot"] == 20
+
+
+def test_action_history_dicts(heads_up):
+    """Test the readable export of the action log."""
+    game = heads_up
+
+    sb = game.players[game.current_player_index]
+    game.process_action(sb.player_id, "raise", 30)
+
+    (entry,) = game.action_history_dicts()
+    assert entry["player_id"] == sb.player_id
+    assert entry["action"] == "raise"
+    assert entry["amount"] == 30
+    assert datetime.fromisoformat(entry["timestamp"]) <= datetime.utcnow()
+
+
+
+def test_action_history_records_chips_committed(heads_up):
+    """Test that calls log the chips moved and checks log 0, whatever amount was sent."""
+    game = heads_up
+    sb = game.players[game._sb_idx]
+    bb = game.players[game._bb_idx]
+
+    game.process_action(sb.player_id, "call", 500)
+    game.process_action(bb.player_id, "check", 70)
+
+    assert [entry["amount"] for entry in game.action_history_dicts()] == [5, 0]
+
+
+@pytest.mark.parametrize("amount", [2**70, "abc", [10]])
+def test_invalid_amount_rejected_before_chips_move(heads_up, amount):
+    """Test that oversized or non-integer amounts are rejected without touching the pot."""
+    game = heads_up
+    sb = game.players[game.current_player_index]
+    state = game.get_state()
+
+    with pytest.raises(ValueError, match=_BAD_AMOUNT):
+        game.process_action(sb.player_id, "call", amount)
+
+    assert game.pot == 15
+    assert sb.stack == 995
+    assert game.players[game.current_player_index] is sb
+    assert game.get_state() == state
+
+def test_get_state_shows_only_requesters_hole_cards(make_game):
+    """Test that each player's view reveals only their own hole cards."""
+    game = make_game(("Alice", "Bob", "Carol"))
+    ids = [p.player_id for p in game.players]
     game.start_new_hand()
 
+    assert all(p["hole_cards"] is None for p in game.get_state()["players"])
+    for seat, player_id in enumerate(ids):
+        views = [p["hole_cards"] for p in game.get_state(player_id)["players"]]
+        assert len(views[seat]) == 2
+        assert all(view is None for i, view in enumerate(views) if i != seat)
+
+
+def test_out_of_turn_action_rejected(heads_up):
+    game = heads_up
+    # In heads-up, SB acts first preflop.
+    sb = game.players[game.current_player_index]
+    bb = game.players[1 - game.players.index(sb)]
+
+    with pytest.raises(ValueError, match=_NOT_YOUR_TURN):
+        game.process_action(bb.player_id, "call", 0)
+
+
+def test_unknown_action_rejected(heads_up):
+    game = heads_up
+
     current_player_id = game.players[game.current_player_index].player_id
-    other_player_id = next(p.player_id for p in game.players if p.player_id != current_player_id)
 
-    with pytest.raises(ValueError, match="Not your turn"):
-        game.process_action(other_player_id, "call", 0)
+    with pytest.raises(ValueError, match=_INVALID_ACTION):
+        game.process_action(current_player_id, "muck", 0)
 
 
-def test_raise_charges_only_additional_amount():
-    game = PokerGame("table1", 9, 5, 10, 1000)
-    game.add_player("Alice")
-    game.add_player("Bob")
+def test_seat_walk_skips_folded_and_wraps(make_game):
+    game = make_game(("Alice", "Bob", "Carol", "Dave"))
+    ids = [p.player_id for p in game.players]
     game.start_new_hand()
 
+    # Dealer is seat 1, so UTG is seat 0 and the BB is seat 3
+    order = []
+    for action in ("call", "fold", "call", "check"):
+        order.append(game.current_player_index)
+        game.process_action(ids[game.current_player_index], action, 0)
+    assert order == [0, 1, 2, 3]
+    assert game.phase.value == "flop"
+
+    # Postflop action starts after the dealer, skips the folded seat and wraps past the last seat
+    order = []
+    while game.phase.value == "flop":
+        order.append(game.current_player_index)
+        game.process_action(ids[game.current_player_index], "check", 0)
+    assert order == [2, 3, 0]
+    assert game.phase.value == "turn"
+    assert game.current_player_index == 2
+
+
+def test_seat_walk_skips_all_in_player(make_game):
+    game = make_game(("Alice", "Bob", "Carol"))
+    ids = [p.player_id for p in game.players]
+    game.players[2].stack = 100
+    game.start_new_hand()
+
+    for action in ("call", "call", "check"):
+        game.process_action(ids[game.current_player_index], action, 0)
+    assert game.phase.value == "flop"
+
+    # Seat 2 checks, then calls a bet all-in for less
+    game.process_action(ids[2], "check", 0)
+    game.process_action(ids[0], "bet", 200)
+    game.process_action(ids[1], "call", 0)
+    game.process_action(ids[2], "call", 0)
+    assert game.players[2].is_all_in is True
+    assert game.phase.value == "turn"
+
+    # The all-in seat is first after the dealer but never gets the action again
+    assert game.current_player_index == 0
+    game.process_action(ids[0], "check", 0)
+    assert game.current_player_index == 1
+    game.process_action(ids[1], "check", 0)
+    assert game.phase.value == "river"
+    assert game.current_player_index == 0
+
+
+def test_player_joining_after_a_hand_is_dealt_into_the_next(make_game):
+    game = make_game(("Alice", "Bob", "Carol"))
+    ids = [p.player_id for p in game.players]
+    game.start_new_hand()
+    game.process_action(ids[1], "fold", 0)
+    game.process_action(ids[2], "fold", 0)
+    assert game.phase.value == "finished"
+
+    # Joins while the table is running: sits out until the next hand
+    ids.append(game.add_player("Dave"))
+    assert game.players[3].is_active is False
+    assert len(game.players[3].hole_cards) == 0
+
+    game.start_new_hand()
+    assert len(game.players[3].hole_cards) == 2
+    order = []
+    while game.phase.value == "preflop":
+        order.append(game.current_player_index)
+        player = game.players[game.current_player_index]
+        game.process_action(player.player_id, "call" if player.bet < game.current_bet else "check", 0)
+    # Dealer is seat 2, so the new seat 3 posts the SB and seat 0 closes the action as BB
+    assert order == [1, 2, 3, 0]
+    assert game.phase.value == "flop"
+
+
+def test_uncontested_pot_skips_showdown(monkeypatch, make_game):
+    game = make_game(("Alice", "Bob", "Carol"))
+    ids = [p.player_id for p in game.players]
+    game.start_new_hand()
+
+    phases = []
+    original_setattr = PokerGame.__setattr__
+
+    def record_phase(self, name, value):
+        if name == "phase":
+            phases.append(value.value)
+        original_setattr(self, name, value)
+
+    monkeypatch.setattr(PokerGame, "__setattr__", record_phase)
+    game.process_action(ids[1], "fold", 0)
+    game.process_action(ids[2], "fold", 0)
+
+    # The BB wins the blinds without the hand passing through showdown
+    assert phases == ["finished"]
+    assert game.pot == 0
+    assert [p.stack for p in game.players] == [1005, 1000, 995]
+
+
+def test_raise_charges_only_additional_amount(heads_up):
+    game = heads_up
+
     # In heads-up, SB acts first preflop.
     sb = game.players[game.current_player_index]
 
@@ -126,42 +353,25 @@ def test_raise_charges_only_additional_amount():
     assert game.current_bet == 20
 
 
-def test_bet_minimum_big_blind_enforced_unless_short_all_in():
-    game = PokerGame("table1", 9, 5, 10, 1000)
-    game.add_player("Alice")
-    game.add_player("Bob")
-    game.start_new_hand()
-
-    # Complete preflop quickly: SB calls, BB checks -> flop (current_bet resets to 0)
-    sb = game.players[game.current_player_index]
-    bb = next(p for p in game.players if p.player_id != sb.player_id)
-
-    game.process_action(sb.player_id, "call", 0)
-    game.process_action(bb.player_id, "check", 0)
+def test_bet_minimum_big_blind_enforced_unless_short_all_in(heads_up_flop):
+    game = heads_up_flop
+    sb = game.players[game._sb_idx]
 
     assert game.phase.value == "flop"
     assert game.current_bet == 0
 
     # It is SB's turn again on flop.
-    current = game.players[game.current_player_index]
+    assert game.players[game.current_player_index] is sb
 
-    with pytest.raises(ValueError, match="Bet must be at least"):
-        game.process_action(current.player_id, "bet", 1)
+    with pytest.raises(ValueError, match=_MIN_BET):
+        game.process_action(sb.player_id, "bet", 1)
 
     # Short stack can go all-in for less than BB.
-    current.stack = 7
-    game.process_action(current.player_id, "bet", 7)
-    assert current.is_all_in is True
-    assert game.current_bet == current.bet
+    sb.stack = 7
+    game.process_action(sb.player_id, "bet", 7)
+    assert sb.is_all_in is True
+    assert game.current_bet == sb.bet
 
 
 if __name__ == "__main__":
-    # Run tests manually
-    test_deck_creation()
-    test_deck_deal()
-    test_player_creation()
-    test_game_creation()
-    test_add_player()
-    test_start_hand()
-    test_get_state()
-    print("✅ All tests passed!")
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -91,15 +91,23 @@ export default function Home() {
 
   // Connect to WebSocket
   const connectWebSocket = useCallback((tid: string, pid: string | null = null) => {
-    const websocket = new WebSocket(`${WS_URL}/ws/${tid}`)
+    // Ask for compressed broadcasts when the browser can inflate them natively
+    const deflate = typeof DecompressionStream !== 'undefined'
+    const websocket = new WebSocket(`${WS_URL}/ws/${tid}${deflate ? '?encoding=deflate' : ''}`)
     
     websocket.onopen = () => {
       console.log('WebSocket connected')
       setIsConnected(true)
     }
     
-    websocket.onmessage = async (event) => {
-      const message = JSON.parse(event.data)
+    const decode = (data: string | Blob): Promise<string> =>
+      // Broadcasts arrive as zlib-compressed binary frames when deflate was requested
+      typeof data === 'string'
+        ? Promise.resolve(data)
+        : new Response(data.stream().pipeThrough(new DecompressionStream('deflate'))).text()
+
+    const apply = async (text: string) => {
+      const message = JSON.parse(text)
       console.log('Received message:', message)
       
       if (message.state) {
@@ -118,6 +126,16 @@ export default function Home() {
         }
       }
     }
+
+    // Handle messages one at a time in arrival order, so a compressed frame
+    // still inflating cannot be applied after a later update
+    let queue: Promise<void> = Promise.resolve()
+    websocket.onmessage = (event) => {
+      queue = queue
+        .then(() => decode(event.data))
+        .then(apply)
+        .catch((error) => console.error('Failed to handle message:', error))
+    }
     
     websocket.onerror = (error) => {
       console.error('WebSocket error:', error)